@@ -1,5 +1,6 @@
 from re import *  # Expresiones regulares
 from collections import OrderedDict  # Diccionario ordenado para mantener el orden de inserción
+from grammar import Grammar, LAMBDA_SYMBOLS, EPSILON, EOF, EPSILON_BIT, bit_ids
 
 # ------------------------------------------------------------------
 
@@ -38,57 +39,251 @@ nt_list = OrderedDict()
 
 production_list = []  # Lista de producciones
 
+grammar = None  # Forma compilada de production_list (ver compile_grammar)
+
+# ------------------------------------------------------------------
+
+def compile_grammar():
+    """
+    Parses production_list once into a grammar.Grammar. Must be called again
+    after editing production_list, nt_list or t_list; compute_all_primeros()
+    does it automatically.
+    """
+    global grammar
+    grammar = Grammar(production_list, nt_list.keys(), t_list.keys())
+    return grammar
+
+def get_grammar():
+    if grammar is None:
+        compile_grammar()
+    if grammar.first is None:
+        _compute_first(grammar)
+    if grammar.follow is None:
+        _compute_follow(grammar)
+    return grammar
+
+def digraph(nodes, edges, base):
+    """
+    DeRemer & Pennello's Digraph: solves F(x) = base[x] ∪ ⋃ F(y) for every
+    edge x → y in one Tarjan traversal, so each strongly connected component
+    is unioned exactly once. Non-recursive, so deep chains don't hit the
+    recursion limit. Values are int bitmasks (any immutable value with | works).
+    """
+    N = dict.fromkeys(nodes, 0)
+    done = len(N) + 1  # Marca ∞ de los nodos cuya SCC ya está cerrada
+    F = {}
+    stack = []
+
+    for root in N:
+        if N[root]:
+            continue
+        stack.append(root)
+        N[root] = len(stack)
+        F[root] = base[root]
+        work = [(root, N[root], iter(edges[root]))]
+
+        while work:
+            x, depth, it = work[-1]
+            for y in it:
+                if N[y] == 0:
+                    stack.append(y)
+                    N[y] = len(stack)
+                    F[y] = base[y]
+                    work.append((y, N[y], iter(edges[y])))
+                    break
+                N[x] = min(N[x], N[y])
+                F[x] |= F[y]
+            else:
+                work.pop()
+                if N[x] == depth:
+                    # x es la raíz de su SCC: todos los miembros comparten F[x]
+                    while True:
+                        top = stack.pop()
+                        N[top] = done
+                        F[top] = F[x]
+                        if top == x:
+                            break
+                if work:
+                    parent = work[-1][0]
+                    N[parent] = min(N[parent], N[x])
+                    F[parent] |= F[x]
+
+    return F
+
+def _compute_nullable(g):
+    # Worklist: una producción se revisa solo cuando un símbolo de su cuerpo se vuelve anulable
+    nullable = set()
+    pending = []  # Símbolos del cuerpo aún no anulables, por producción
+    occurrences = {nt: [] for nt in g.nonterminals}
+    work = []
+
+    for p, body in enumerate(g.bodies):
+        if any(g.is_terminal(sym) for sym in body):
+            pending.append(-1)  # Nunca anulable
+            continue
+        pending.append(len(body))
+        for sym in body:
+            occurrences[sym].append(p)
+        if not body:
+            work.append(g.heads[p])
+
+    while work:
+        nt = work.pop()
+        if nt in nullable:
+            continue
+        nullable.add(nt)
+        for p in occurrences[nt]:
+            pending[p] -= 1
+            if pending[p] == 0:
+                work.append(g.heads[p])
+
+    return nullable
+
+def _compute_first(g):
+    nullable = _compute_nullable(g)
+
+    # First directo de cada cabeza y aristas A → B si B es esquina izquierda de A
+    base = dict.fromkeys(g.nonterminals, 0)
+    edges = {nt: set() for nt in g.nonterminals}
+    for head, body in zip(g.heads, g.bodies):
+        for sym in body:
+            if g.is_terminal(sym):
+                base[head] |= 1 << sym
+                break
+            edges[head].add(sym)
+            if sym not in nullable:
+                break
+
+    first = digraph(g.nonterminals, edges, base)
+    for nt in nullable:
+        first[nt] |= EPSILON_BIT
+
+    g.nullable = nullable
+    g.first = first
+    _compute_suffixes(g)
+
+def _compute_suffixes(g):
+    """
+    First (without λ) and nullability of every production suffix, so
+    First(β) for β = body[i:] of production p is g.suffix_first[p][i] and
+    "β is nullable" is g.suffix_nullable[p][i].
+    """
+    g.suffix_first = []
+    g.suffix_nullable = []
+
+    for body in g.bodies:
+        firsts = [0] * (len(body) + 1)
+        nullables = [True] * (len(body) + 1)
+        for i in range(len(body) - 1, -1, -1):
+            sym = body[i]
+            if g.is_terminal(sym):
+                firsts[i] = 1 << sym
+                nullables[i] = False
+            elif sym in g.nullable:
+                firsts[i] = firsts[i + 1] | (g.first[sym] & ~EPSILON_BIT)
+                nullables[i] = nullables[i + 1]
+            else:
+                firsts[i] = g.first[sym] & ~EPSILON_BIT
+                nullables[i] = False
+        g.suffix_first.append(firsts)
+        g.suffix_nullable.append(nullables)
+
+def _compute_follow(g):
+    """
+    FOLLOW as a set of constraints built in one pass: for every A → α B β,
+    First(β) - {λ} goes into base[B], and if β is nullable there is an edge
+    B → A meaning Follow(A) ⊆ Follow(B). The edges are solved with digraph().
+    """
+    base = dict.fromkeys(g.nonterminals, 0)
+    edges = {nt: set() for nt in g.nonterminals}
+    if g.start is not None:
+        base[g.start] |= 1 << EOF
+
+    for p, (head, body) in enumerate(zip(g.heads, g.bodies)):
+        for i, B in enumerate(body):
+            if not g.is_nonterminal(B):
+                continue
+            # First(β) y la anulabilidad de β salen de la tabla de sufijos
+            base[B] |= g.suffix_first[p][i + 1]
+            if g.suffix_nullable[p][i + 1]:
+                edges[B].add(head)
+
+    g.follow = digraph(g.nonterminals, edges, base)
+
+def _compute_productive(g):
+    # Igual que _compute_nullable, pero los terminales cuentan como productivos
+    productive = set()
+    pending = []
+    occurrences = {nt: [] for nt in g.nonterminals}
+    work = []
+
+    for p, body in enumerate(g.bodies):
+        nts = [sym for sym in body if g.is_nonterminal(sym)]
+        pending.append(len(nts))
+        for sym in nts:
+            occurrences[sym].append(p)
+        if not nts:
+            work.append(g.heads[p])
+
+    while work:
+        nt = work.pop()
+        if nt in productive:
+            continue
+        productive.add(nt)
+        for p in occurrences[nt]:
+            pending[p] -= 1
+            if pending[p] == 0:
+                work.append(g.heads[p])
+
+    return productive
+
+def lr0_closures(g):
+    """
+    For every nonterminal B, the productions whose items [C → . γ] make up
+    the LR(0) closure of B: B's own productions, then those of every
+    nonterminal reachable from B through left corners. The reachability is
+    solved once with digraph() over nonterminal bitmasks and cached on g.
+    """
+    if g.lr0_closure is None:
+        base = {nt: 1 << nt for nt in g.nonterminals}
+        edges = {nt: set() for nt in g.nonterminals}
+        for head, body in zip(g.heads, g.bodies):
+            if body and g.is_nonterminal(body[0]):
+                edges[head].add(body[0])
+        reach = digraph(g.nonterminals, edges, base)
+
+        g.lr0_closure = {}
+        for nt in g.nonterminals:
+            prods = list(g.by_head[nt])
+            for other in bit_ids(reach[nt] & ~(1 << nt)):
+                prods.extend(g.by_head[other])
+            g.lr0_closure[nt] = tuple(prods)
+    return g.lr0_closure
+
+def first_of_ids(g, syms):
+    # Máscara First de una secuencia de ids; incluye λ si toda la secuencia es anulable
+    result = 0
+    for sym in syms:
+        if g.is_terminal(sym):
+            return result | (1 << sym)
+        result |= g.first[sym] & ~EPSILON_BIT
+        if not g.first[sym] & EPSILON_BIT:
+            return result
+    return result | EPSILON_BIT
+
 # ------------------------------------------------------------------
 
 def compute_all_primeros():
     global production_list, nt_list, t_list
 
-    changed = True
-    while changed:
-        changed = False
-        for prod in production_list:
-            head, body = prod.split('→')
-            head = head.strip()
-            body_syms = body.strip().split()
-
-            if body == '':
-                body_syms = [LAMBDA]
-
-            all_nullable = True
-            for sym in body_syms:
-                # Terminal o símbolo especial
-                if sym in t_list or sym == '$':
-                    if sym not in nt_list[head].primero:
-                        nt_list[head].primero.add(sym)
-                        changed = True
-                    all_nullable = False
-                    break
-                elif sym == LAMBDA:
-                    if LAMBDA not in nt_list[head].primero:
-                        nt_list[head].primero.add(LAMBDA)
-                        changed = True
-                    all_nullable = False
-                    break
-                else:
-                    # NonTerminal
-                    if sym not in nt_list:
-                        continue
-                        
-                    before = len(nt_list[head].primero)
-                    nt_list[head].primero |= (nt_list[sym].primero - {LAMBDA})
-                    if len(nt_list[head].primero) > before:
-                        changed = True
-
-                    if LAMBDA in nt_list[sym].primero:
-                        continue
-                    else:
-                        all_nullable = False
-                        break
-
-            if all_nullable:
-                if LAMBDA not in nt_list[head].primero:
-                    nt_list[head].primero.add(LAMBDA)
-                    changed = True
+    g = compile_grammar()
+    _compute_first(g)
+
+    for nt in g.nonterminals:
+        name = g.symbols[nt]
+        if name not in nt_list:
+            nt_list[name] = NonTerminal(name)
+        nt_list[name].add_primero(g.mask_names(g.first[nt]))
 
 def compute_primero(symbol=None):
     # Wrapper triggering global calculation
@@ -107,46 +302,15 @@ def compute_primero(symbol=None):
 def compute_all_siguientes():
     global production_list, nt_list, t_list
     
-    # Initialize Start Symbol Follow if empty (or always ensure it has $)
     if not nt_list:
         return
 
-    start_symbol = list(nt_list.keys())[0]
-    nt_list[start_symbol].add_siguiente({'$'})
-
-    changed = True
-    while changed:
-        changed = False
-        
-        for prod in production_list:
-            head, body = prod.split('→')
-            head = head.strip()
-            body_tokens = body.strip().split()
-
-            for i, B in enumerate(body_tokens):
-                if B not in nt_list:
-                    continue
-
-                # Case A → α B β
-                # Follow(B) += First(β) - {λ}
-                
-                # Calculate First(β)
-                beta = body_tokens[i + 1:]
-                first_beta = compute_first_sequence(beta)
-                
-                before_len = len(nt_list[B].siguiente)
-                
-                nt_list[B].add_siguiente(first_beta - {LAMBDA})
-                
-                # If β is nullable (λ in First(β)) or β is empty (end of production)
-                # Follow(B) += Follow(head)
-                if not beta or LAMBDA in first_beta:
-                    current_head_follow = nt_list[head].siguiente
-                    if not nt_list[B].siguiente.issuperset(current_head_follow):
-                         nt_list[B].add_siguiente(current_head_follow)
-                    
-                if len(nt_list[B].siguiente) > before_len:
-                    changed = True
+    g = get_grammar()
+
+    for nt in g.nonterminals:
+        name = g.symbols[nt]
+        if name in nt_list:
+            nt_list[name].add_siguiente(g.mask_names(g.follow[nt]))
 
 def compute_siguiente(symbol):
     compute_all_siguientes()
@@ -168,69 +332,545 @@ def get_siguiente(symbol):
 # ------------------------------------------------------------------
 
 def compute_first_sequence(symbols):
-    result = set()
+    g = get_grammar()
+    ids = []
     for sym in symbols:
-        # We assume firsts are already computed globally if we are inside compute_all_siguientes
-        if sym in t_list or sym == '$':
-            first = {sym}
-        elif sym in nt_list:
-            first = nt_list[sym].primero
-        else:
-            first = set() # Unknown symbol
-            
-        result.update(first - {LAMBDA})
-        if LAMBDA not in first:
-            break
+        if sym not in g.ids:
+            break  # Símbolo desconocido: First vacío
+        if g.ids[sym] != EPSILON:
+            ids.append(g.ids[sym])
     else:
-        result.add(LAMBDA)
-    return result
+        return set(g.mask_names(first_of_ids(g, ids)))
+    return set(g.mask_names(first_of_ids(g, ids) & ~EPSILON_BIT))
 
 
 # ------------------------------------------------------------------
-def main(pl=None):
+
+def reduce_grammar():
+    """
+    Removes the nonterminals that can't derive any terminal string, then
+    the ones not reachable from the start symbol, along with every
+    production that mentions them. Terminals that end up unused are
+    dropped from t_list. Meant to run after loading and before
+    augment_grammar. Returns (removed_symbols, removed_productions).
+    """
+    g = compile_grammar()
+    productive = _compute_productive(g)
+    if g.start is None or g.start not in productive:
+        raise ValueError("El símbolo inicial no genera ninguna cadena")
+
+    def useful(p):
+        return all(g.is_terminal(sym) or sym in productive for sym in g.bodies[p])
+
+    # Alcanzables desde el inicial usando solo producciones productivas
+    reachable = {g.start}
+    work = [g.start]
+    while work:
+        nt = work.pop()
+        for p in g.by_head[nt]:
+            if not useful(p):
+                continue
+            for sym in g.bodies[p]:
+                if g.is_nonterminal(sym) and sym not in reachable:
+                    reachable.add(sym)
+                    work.append(sym)
+
+    kept = [p for p, head in enumerate(g.heads) if head in reachable and useful(p)]
+    used = {sym for p in kept for sym in g.bodies[p]} | reachable
+
+    removed_symbols = [g.symbols[sym] for sym in range(EOF + 1, len(g.symbols)) if sym not in used]
+    kept_set = set(kept)
+    removed_productions = [text for p, text in enumerate(g.productions) if p not in kept_set]
+
+    production_list[:] = [g.productions[p] for p in kept]
+    for name in removed_symbols:
+        nt_list.pop(name, None)
+        t_list.pop(name, None)
+    for nt in nt_list.values():
+        if nt is not None:
+            nt.primero = set()
+            nt.siguiente = set()
+    compile_grammar()
+
+    return removed_symbols, removed_productions
+
+# ------------------------------------------------------------------
+# Edición incremental: agregar, quitar o reemplazar una producción y
+# actualizar solo los First/Follow afectados.
+
+def add_production(prod, index=None):
+    """
+    Adds prod (e.g. "A → a B") to the grammar at position index (default:
+    the end) and updates First/Follow by propagating only the new bits.
+    Returns the names of the nonterminals whose First or Follow changed.
+    """
+    return _edit(None, prod, index)
+
+def remove_production(prod):
+    """
+    Removes prod (text, or its index in production_list). The nonterminals
+    that may depend on it are reset and re-derived from their productions;
+    the rest of the grammar is left untouched. Returns the changed names.
+    """
+    return _edit(prod, None, None)
+
+def replace_production(old, new):
+    # Quita old y agrega new en la misma posición: los números de producción no cambian
+    return _edit(old, new, None)
+
+def _parse_production(prod):
+    if '→' not in prod:
+        raise ValueError(f"Producción mal formada, sin '→': {prod}")
+    head, body = prod.split('→', 1)
+    return head.strip(), [sym for sym in body.split() if sym not in LAMBDA_SYMBOLS]
+
+def _find_production(g, prod):
+    if isinstance(prod, int):
+        if not 0 <= prod < len(g.heads):
+            raise ValueError(f"Producción no encontrada: {prod}")
+        return prod
+    head, body = _parse_production(prod)
+    if head in g.ids and all(sym in g.ids for sym in body):
+        p = g.production_number(g.ids[head], [g.ids[sym] for sym in body])
+        if p != -1:
+            return p
+    raise ValueError(f"Producción no encontrada: {prod}")
+
+def _edit(old, new, index):
+    g = get_grammar()
+
+    p = _find_production(g, old) if old is not None else None
+    if new is not None:
+        head, body = _parse_production(new)
+        if index is None:
+            index = len(g.heads) if p is None else p
+        # Un terminal nuevo (o un terminal que pasa a ser cabeza) cambia la
+        # numeración de los símbolos, y sin símbolo inicial no hay Follow
+        # que propagar: en esos casos se recompila todo
+        if g.start is None or g.ids.get(head, len(g.symbols)) < g.n_terminals or \
+                any(sym not in g.ids and sym != head for sym in body):
+            return _rebuild(p, new, index)
+
+    if g.uses is None:
+        _index_productions(g)
+    before = {}  # nt -> (First, Follow) antes de la edición
+
+    g.lr0_closure = None  # Cambian las producciones: se recalcula al usarse
+    if p is not None:
+        _delete_production(g, p, before)
+    if new is not None:
+        if head not in g.ids:
+            _add_nonterminal(g, head)
+            nt_list[head] = NonTerminal(head)
+        _insert_production(g, index, g.ids[head], tuple(g.ids[sym] for sym in body), new, before)
+
+    changed = set()
+    for nt, (first, follow) in before.items():
+        if g.first[nt] != first or g.follow[nt] != follow:
+            name = g.symbols[nt]
+            if nt_list.get(name) is None:
+                nt_list[name] = NonTerminal(name)
+            nt_list[name].primero = set(g.mask_names(g.first[nt]))
+            nt_list[name].siguiente = set(g.mask_names(g.follow[nt]))
+            changed.add(name)
+    return changed
+
+def _rebuild(p, new, index):
+    # Recalculo completo; devuelve igualmente solo los no terminales que cambiaron
+    old = {name: (set(nt.primero), set(nt.siguiente)) for name, nt in nt_list.items() if nt is not None}
+    if p is not None:
+        del production_list[p]
+    production_list.insert(index, new)
+    head, body = _parse_production(new)
+    t_list.pop(head, None)  # Un terminal que pasa a ser cabeza deja de serlo
+    for sym in body:
+        if sym != head and sym not in nt_list and sym not in t_list:
+            t_list[sym] = Terminal(sym)
+
+    for nt in nt_list.values():
+        if nt is not None:
+            nt.primero = set()
+            nt.siguiente = set()
+    compute_all_primeros()
+    compute_all_siguientes()
+    return {name for name, nt in nt_list.items()
+            if (nt.primero, nt.siguiente) != old.get(name, (set(), set()))}
+
+def _index_productions(g):
+    # by_head y los usos (p, i) de cada no terminal en los cuerpos
+    g._numbers = None  # Los índices cambiaron: production_number lo rearma al usarse
+    g.by_head = {nt: [] for nt in g.nonterminals}
+    g.uses = {nt: [] for nt in g.nonterminals}
+    for p, (head, body) in enumerate(zip(g.heads, g.bodies)):
+        g.by_head[head].append(p)
+        for i, sym in enumerate(body):
+            if g.is_nonterminal(sym):
+                g.uses[sym].append((p, i))
+
+def _add_nonterminal(g, name):
+    # Los no terminales van al final de la numeración, agregar uno no mueve a nadie
+    nt = g._intern(name)
+    g.by_head[nt] = []
+    g.uses[nt] = []
+    g.first[nt] = 0
+    g.follow[nt] = 0
+
+def _snapshot(g, before, nts):
+    for nt in nts:
+        if nt not in before:
+            before[nt] = (g.first[nt], g.follow[nt])
+
+def _nullable_prefix(g, p):
+    # Cantidad de símbolos iniciales anulables del cuerpo de p
+    k = 0
+    for sym in g.bodies[p]:
+        if sym not in g.nullable:
+            break
+        k += 1
+    return k
+
+def _suffix_row(g, body):
+    firsts = [0] * (len(body) + 1)
+    nullables = [True] * (len(body) + 1)
+    for i in range(len(body) - 1, -1, -1):
+        sym = body[i]
+        if g.is_terminal(sym):
+            firsts[i] = 1 << sym
+            nullables[i] = False
+        else:
+            firsts[i] = g.first[sym] & ~EPSILON_BIT
+            if sym in g.nullable:
+                firsts[i] |= firsts[i + 1]
+                nullables[i] = nullables[i + 1]
+            else:
+                nullables[i] = False
+    return firsts, nullables
+
+def _first_dependents(g, nts):
+    # Cierre de nts por "First(A) depende de X": X en un prefijo anulable de A
+    seen = set(nts)
+    work = list(nts)
+    while work:
+        x = work.pop()
+        for p, i in g.uses[x]:
+            head = g.heads[p]
+            if head not in seen and _nullable_prefix(g, p) >= i:
+                seen.add(head)
+                work.append(head)
+    return seen
+
+def _follow_dependents(g, nts):
+    # Cierre por "Follow(C) ⊇ Follow(A)": C al final anulable de una producción de A
+    seen = set(nts)
+    work = list(nts)
+    while work:
+        a = work.pop()
+        for p in g.by_head[a]:
+            for i, c in enumerate(g.bodies[p]):
+                if g.is_nonterminal(c) and c not in seen and g.suffix_nullable[p][i + 1]:
+                    seen.add(c)
+                    work.append(c)
+    return seen
+
+def _propagate_first(g, work, before):
+    """
+    work: (nt, mask) pairs. Adds each mask to First(nt) and pushes only the
+    bits that were new to the productions where nt sits after a nullable
+    prefix. λ is handled separately through g.nullable.
+    """
+    while work:
+        nt, mask = work.pop()
+        new = mask & ~g.first[nt] & ~EPSILON_BIT
+        if not new:
+            continue
+        _snapshot(g, before, (nt,))
+        g.first[nt] |= new
+        for p, i in g.uses[nt]:
+            if _nullable_prefix(g, p) >= i:
+                work.append((g.heads[p], new))
+
+def _propagate_nullable(g, candidates, before):
+    # Worklist: marca anulables los candidatos con alguna producción de cuerpo anulable
+    newly = []
+    work = list(candidates)
+    while work:
+        nt = work.pop()
+        if nt in g.nullable:
+            continue
+        if any(all(sym in g.nullable for sym in g.bodies[p]) for p in g.by_head[nt]):
+            _snapshot(g, before, (nt,))
+            g.nullable.add(nt)
+            g.first[nt] |= EPSILON_BIT
+            newly.append(nt)
+            work.extend(g.heads[p] for p, _ in g.uses[nt])
+    return newly
+
+def _propagate_follow(g, work, before):
+    # Igual que _propagate_first, sobre las aristas Follow(A) ⊆ Follow(C)
+    while work:
+        nt, mask = work.pop()
+        new = mask & ~g.follow[nt]
+        if not new:
+            continue
+        _snapshot(g, before, (nt,))
+        g.follow[nt] |= new
+        for p in g.by_head[nt]:
+            for i, c in enumerate(g.bodies[p]):
+                if g.is_nonterminal(c) and g.suffix_nullable[p][i + 1]:
+                    work.append((c, new))
+
+def _follow_seed(g, p, work):
+    # Aportes de la producción p a los Follow de los no terminales de su cuerpo
+    for i, b in enumerate(g.bodies[p]):
+        if g.is_nonterminal(b):
+            mask = g.suffix_first[p][i + 1]
+            if g.suffix_nullable[p][i + 1]:
+                mask |= g.follow[g.heads[p]]
+            work.append((b, mask))
+
+def _refresh_suffixes(g, nts):
+    # Recalcula las filas de sufijos de las producciones que usan nts; devuelve cuáles cambiaron
+    rows = set()
+    for nt in nts:
+        rows.update(p for p, _ in g.uses[nt])
+    changed = []
+    for p in rows:
+        firsts, nullables = _suffix_row(g, g.bodies[p])
+        if firsts != g.suffix_first[p] or nullables != g.suffix_nullable[p]:
+            g.suffix_first[p] = firsts
+            g.suffix_nullable[p] = nullables
+            changed.append(p)
+    return changed
+
+def _insert_production(g, p, head, body, text, before):
+    # Agregar solo hace crecer First/Follow: basta propagar los bits nuevos
+    g.productions.insert(p, text)
+    production_list.insert(p, text)
+    g.heads.insert(p, head)
+    g.bodies.insert(p, body)
+    g.suffix_first.insert(p, None)
+    g.suffix_nullable.insert(p, None)
+    if p == len(g.heads) - 1:
+        if g._numbers is not None:
+            g._numbers.setdefault((head, body), p)
+        g.by_head[head].append(p)
+        for i, sym in enumerate(body):
+            if g.is_nonterminal(sym):
+                g.uses[sym].append((p, i))
+    else:
+        _index_productions(g)
+    _snapshot(g, before, (head,))
+
+    newly = _propagate_nullable(g, [head], before)
+    work = [(head, first_of_ids(g, body))]
+    for nt in newly:
+        # Un no terminal que se vuelve anulable destapa lo que le sigue en cada uso
+        work.extend((g.heads[q], first_of_ids(g, g.bodies[q])) for q, _ in g.uses[nt])
+    _propagate_first(g, work, before)
+
+    g.suffix_first[p], g.suffix_nullable[p] = _suffix_row(g, body)
+    rows = [p] + _refresh_suffixes(g, before.keys())
+    work = []
+    for q in rows:
+        _follow_seed(g, q, work)
+    _propagate_follow(g, work, before)
+
+def _delete_production(g, p, before):
+    """
+    Removing can shrink sets, so the nonterminals that may depend on p are
+    reset and re-derived from their remaining productions (delete and
+    rederive); everything outside that region keeps its value.
+    """
+    head, body = g.heads[p], g.bodies[p]
+    first_region = _first_dependents(g, [head])
+    follow_seeds = {sym for sym in body if g.is_nonterminal(sym)}
+
+    del g.productions[p]
+    del production_list[p]
+    del g.heads[p]
+    del g.bodies[p]
+    del g.suffix_first[p]
+    del g.suffix_nullable[p]
+    _index_productions(g)
+
+    # First: se vacían los afectados y se vuelven a derivar
+    _snapshot(g, before, first_region)
+    for nt in first_region:
+        g.nullable.discard(nt)
+        g.first[nt] = 0
+    _propagate_nullable(g, first_region, before)
+    work = []
+    for nt in first_region:
+        work.extend((nt, first_of_ids(g, g.bodies[q])) for q in g.by_head[nt])
+    _propagate_first(g, work, before)
+
+    # Follow: sembrar con los que aparecían en p o en sufijos que cambiaron
+    for q in _refresh_suffixes(g, first_region):
+        follow_seeds.update(sym for sym in g.bodies[q] if g.is_nonterminal(sym))
+    follow_region = _follow_dependents(g, follow_seeds)
+    _snapshot(g, before, follow_region)
+    for nt in follow_region:
+        g.follow[nt] = 1 << EOF if nt == g.start else 0
+    work = []
+    for nt in follow_region:
+        for q, _ in g.uses[nt]:
+            _follow_seed(g, q, work)
+    _propagate_follow(g, [(nt, mask) for nt, mask in work if nt in follow_region], before)
+
+# ------------------------------------------------------------------
+def load_productions(pl):
+    """
+    Registers the symbols of pl in nt_list / t_list in two linear passes:
+    the first collects the production heads, the second classifies every
+    body symbol against that set (heads are nonterminals, the rest are
+    terminals). Symbols already declared keep their classification.
+
+    Returns (unknown, unused):
+      unknown: body symbols that were not declared and had to be inferred
+               as terminals (only when terminals were declared up front),
+               plus nonterminals that are used but have no production.
+      unused:  declared symbols that no production mentions.
+    """
     global production_list, nt_list, t_list
 
-    if pl:
+    if pl is not production_list:
         production_list[:] = pl
+    declared = list(nt_list) + [t for t in t_list if t not in LAMBDA_SYMBOLS]
+    terminals_declared = any(t not in LAMBDA_SYMBOLS for t in t_list)
+
+    # Primera pasada: cabezas de producción
+    parsed = []
+    heads = set()
+    for prod in production_list:
+        if '→' not in prod:
+            raise ValueError(f"Producción mal formada, sin '→': {prod}")
+        head, body = prod.split('→', 1)
+        head = head.strip()
+        heads.add(head)
+        parsed.append((head, body.split()))
+
+    # Segunda pasada: clasificar cada símbolo del cuerpo
+    used = set(heads)
+    unknown = []
+    for head, body in parsed:
+        # Asegura que el símbolo de la cabeza es un no terminal
+        if nt_list.get(head) is None:
+            nt_list[head] = NonTerminal(head)
+
+        for sym in body:
+            if sym in LAMBDA_SYMBOLS:
+                continue
+            used.add(sym)
+
+            if sym in nt_list:
+                if nt_list[sym] is None:
+                    nt_list[sym] = NonTerminal(sym)
+            elif sym in t_list:
+                if t_list[sym] is None:
+                    t_list[sym] = Terminal(sym)
+            elif sym in heads:
+                nt_list[sym] = NonTerminal(sym)
+            else:
+                # No es cabeza de ninguna producción: terminal inferido
+                t_list[sym] = Terminal(sym)
+                if terminals_declared:
+                    unknown.append(sym)
+
+    # No terminales usados en algún cuerpo pero sin producciones
+    unknown += [nt for nt in nt_list if nt not in heads and nt in used]
+    unused = [sym for sym in declared if sym not in used]
+
+    return unknown, unused
+
+def load_grammar_file(path, encoding='utf-8'):
+    """
+    Streams a grammar file into nt_list / t_list / production_list, one line
+    at a time, so only the production list itself is kept in memory. Format:
+
+        # comentario (también //)
+        %nonterminals E | T | F
+        %terminals id | + | * | ( | )
+        E -> E + T | T
+        T → T * F
+          | F            (una línea que empieza con '|' sigue a la última cabeza)
+        F -> ( E ) | id
+        A ->             (alternativa vacía = λ)
+
+    The lists are cleared first. Symbols are then classified with
+    load_productions, whose (unknown, unused) report is returned.
+    """
+    global production_list, nt_list, t_list
 
-        for prod in production_list:
-            head, body = prod.split('→')
-            head = head.strip()
-            body_tokens = body.strip().split()
-
-            # Asegura que el símbolo de la cabeza es un no terminal
-            if head not in nt_list:
-                nt_list[head] = NonTerminal(head)
-
-            for sym in body_tokens:
-                if sym == LAMBDA:
-                    continue
-
-                if sym not in nt_list and sym not in t_list:
-                    # Si el símbolo aparece por primera vez
-                    # Lo consideramos terminal si no ha sido cabeza de producción
-                    is_non_terminal = any(sym == p.split('→')[0].strip() for p in production_list)
-                    if is_non_terminal:
-                        if sym not in nt_list:
-                             nt_list[sym] = NonTerminal(sym)
-                    else:
+    nt_list.clear()
+    t_list.clear()
+    production_list.clear()
+    head = None
+
+    with open(path, encoding=encoding) as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith('//'):
+                continue
+
+            if line.startswith('%'):
+                directive, _, rest = line.partition(' ')
+                names = [sym for part in rest.split('|') for sym in part.split()]
+                if directive in ('%nonterminals', '%nt'):
+                    for sym in names:
+                        nt_list[sym] = NonTerminal(sym)
+                elif directive in ('%terminals', '%t'):
+                    for sym in names:
                         t_list[sym] = Terminal(sym)
-                # Si el símbolo ya existe pero hay conflicto de instanciacion
-                elif sym in t_list and t_list[sym] is None:
-                    t_list[sym] = Terminal(sym)
-                elif sym in nt_list and nt_list[sym] is None:
-                    nt_list[sym] = NonTerminal(sym)
-                    
+                else:
+                    raise ValueError(f"Línea {n}: declaración desconocida: {directive}")
+                continue
+
+            if line.startswith('|'):
+                if head is None:
+                    raise ValueError(f"Línea {n}: alternativa sin cabeza: {line}")
+                alternatives = line[1:]
+            else:
+                # La cabeza termina en el primer separador que aparezca, sea '->' o '→'
+                arrows = [(line.find(arrow), arrow) for arrow in ('->', '→') if arrow in line]
+                if not arrows:
+                    raise ValueError(f"Línea {n}: producción mal formada, sin '→': {line}")
+                at, arrow = min(arrows)
+                head, alternatives = line[:at].strip(), line[at + len(arrow):]
+                if not head:
+                    raise ValueError(f"Línea {n}: producción sin cabeza: {line}")
+            if '->' in alternatives or '→' in alternatives:
+                raise ValueError(f"Línea {n}: más de un separador en la producción: {line}")
+
+            for alternative in alternatives.split('|'):
+                body = alternative.split()
+                production_list.append(f"{head} → {' '.join(body) if body else LAMBDA}")
+
+    return load_productions(production_list)
+
+def main(pl=None):
+    # pl: lista de producciones o ruta de un archivo de gramática
+    if pl:
+        if isinstance(pl, str):
+            unknown, unused = load_grammar_file(pl)
+        else:
+            unknown, unused = load_productions(pl)
+        if unknown:
+            print("Símbolos desconocidos:", ", ".join(unknown))
+        if unused:
+            print("Símbolos declarados sin usar:", ", ".join(unused))
+
         # RUN LOGIC
         compute_all_primeros()
         compute_all_siguientes()
 
         return pl
     else:
-        print("Debe pasarse una lista de producciones como argumento.")
+        print("Debe pasarse una lista de producciones o la ruta de un archivo de gramática.")
 
 # ------------------------------------------------------------------
 
 if __name__ == '__main__':
+    import sys
     from pprint import pprint
-    main()
+    if main(sys.argv[1] if len(sys.argv) > 1 else None):
+        pprint({name: (nt.primero, nt.siguiente) for name, nt in nt_list.items()})
@@ -1,5 +1,7 @@
-from collections import OrderedDict
+from collections import deque, OrderedDict
 import firstandfollows
+import lrtable
+from grammar import EOF, bit_ids
 
 # Standardized aliases
 nt_list = []
@@ -9,104 +11,155 @@ t_list = []
 class State:
     _id = 0
 
-    def __init__(self, closure):
-        self.closure = closure
+    def __init__(self, closure=None, kernel=None):
+        # Sin closure (modo kernel_only de calc_states) solo se guarda el
+        # núcleo y la clausura se vuelve a expandir cada vez que se pide
+        self._closure = closure
+        self.kernel = kernel
         self.no = State._id
+        self.goto = OrderedDict()  # símbolo -> número del estado destino
+        # Gramática con la que se construyó: sus items se muestran con ella
+        # aunque después se compile otra
+        self.grammar = firstandfollows.get_grammar()
         State._id += 1
 
+    @property
+    def closure(self):
+        if self._closure is None:
+            return closure(list(self.kernel), self.grammar)
+        return self._closure
 
-class Item(str):
-    def __new__(cls, item, lookahead=None):
-        if '.' not in item:
-            raise ValueError(f"Item mal formado, sin '.': {item}")
-        self = str.__new__(cls, item)
-        self.lookahead = sorted(list(lookahead)) if lookahead else []
-        return self
+    @closure.setter
+    def closure(self, items):
+        self._closure = items
+
+
+class Item:
+    """
+    LR(1) item as a position in the compiled grammar (production index and
+    dot position) plus its lookaheads as a bitmask over terminal ids. The
+    text form is only built for display (see text()).
+    """
+    __slots__ = ('prod', 'dot', 'lookahead_bits')
+
+    def __init__(self, prod, dot=0, lookahead=0):
+        self.prod = prod
+        self.dot = dot
+        # Lookaheads como máscara de bits; también se aceptan nombres de terminales
+        if isinstance(lookahead, int):
+            self.lookahead_bits = lookahead
+        else:
+            self.lookahead_bits = firstandfollows.get_grammar().mask(lookahead)
+
+    @property
+    def core(self):
+        return (self.prod, self.dot)
+
+    def next_symbol(self, g):
+        # Id del símbolo después del punto, None si el punto está al final
+        body = g.bodies[self.prod]
+        return body[self.dot] if self.dot < len(body) else None
+
+    @property
+    def lookahead(self):
+        # Nombres ordenados, solo para mostrar y llenar la tabla
+        return self.lookahead_names()
+
+    def lookahead_names(self, g=None):
+        if g is None:
+            g = firstandfollows.get_grammar()
+        return sorted(g.mask_names(self.lookahead_bits))
+
+    def text(self, dot='.', arrow='→', g=None):
+        # g: gramática de los ids (por defecto la actual, ver State.grammar)
+        if g is None:
+            g = firstandfollows.get_grammar()
+        names = g.names(g.bodies[self.prod])
+        return g.symbols[g.heads[self.prod]] + arrow + ' '.join(names[:self.dot] + [dot] + names[self.dot:])
 
     def __str__(self):
-        return super(Item, self).__str__() + ", " + '|'.join(self.lookahead)
+        return self.text() + ", " + '|'.join(self.lookahead)
+
+    def __repr__(self):
+        return f"Item({str(self)!r})"
 
     def __eq__(self, other):
         if not isinstance(other, Item):
             return False
-        return str(self) == str(other) and self.lookahead == other.lookahead
+        return self.prod == other.prod and self.dot == other.dot and self.lookahead_bits == other.lookahead_bits
 
     def __hash__(self):
-        return hash((str(self), tuple(self.lookahead)))
+        return hash((self.prod, self.dot, self.lookahead_bits))
 
 
 
-def closure(items):
-    def exists(newitem, items):
-        for i in items:
-            if i == newitem: # Uses __eq__ which checks lookahead
-                return True
-        return False
+def closure(items, g=None):
+    if g is None:
+        g = firstandfollows.get_grammar()
 
-    global nt_list
-    while True:
-        flag = 0
-        for i in items:
-            head, body = i.split('→')
-            symbols = split_body_with_dot(body.strip())
-
-            if '.' not in symbols or symbols.index('.') == len(symbols) - 1:
-                continue
-
-            dot_pos = symbols.index('.')
-            B = symbols[dot_pos + 1]  # símbolo después del punto
+    # Un solo item por core: los lookaheads que llegan a un core ya presente
+    # se suman a su máscara (los items no se modifican, se reemplazan)
+    merged = []
+    at = {}  # core -> posición en merged
+    for i in items:
+        if i.core in at:
+            k = at[i.core]
+            merged[k] = Item(i.prod, i.dot, merged[k].lookahead_bits | i.lookahead_bits)
+        else:
+            at[i.core] = len(merged)
+            merged.append(i)
+
+    # Worklist: cada item propaga solo los lookaheads que aún no propagó
+    pending = [i.lookahead_bits for i in merged]
+    expanded = [False] * len(merged)
+    queued = [True] * len(merged)
+    work = deque(range(len(merged)))
+    while work:
+        k = work.popleft()
+        queued[k] = False
+        i = merged[k]
+        new, pending[k] = pending[k], 0
+        B = i.next_symbol(g)  # símbolo después del punto
+
+        if B is None or not g.is_nonterminal(B):
+            continue
 
-            if B not in nt_list:
+        # First(β la) sale de la tabla de sufijos: β = lo que sigue después de B.
+        # First(β) se propaga una sola vez; después, solo los lookaheads nuevos
+        lookaheads = 0 if expanded[k] else g.suffix_first[i.prod][i.dot + 1]
+        if g.suffix_nullable[i.prod][i.dot + 1]:
+            lookaheads |= new
+        if expanded[k] and not lookaheads:
+            continue
+        expanded[k] = True
+
+        for prod in g.by_head[B]:
+            core = (prod, 0)
+            if core not in at:
+                at[core] = len(merged)
+                merged.append(Item(prod, 0, lookaheads))
+                pending.append(lookaheads)
+                expanded.append(False)
+                queued.append(True)
+                work.append(at[core])
                 continue
 
-            beta = symbols[dot_pos + 2:]  # lo que sigue después de B
-            lookaheads = set()
-
-            for la in i.lookahead:
-                sequence = beta + [la]
-                result = firstandfollows.compute_first_sequence(sequence)
-                lookaheads.update(result)
-
-            for prod in firstandfollows.production_list:
-                lhs, rhs = prod.split('→')
-                if lhs.strip() != B:
-                    continue
-
-                rhs_symbols = rhs.strip().split()
-                new_body = '. ' + ' '.join(rhs_symbols)
-                new_item = Item(f"{B}→{new_body}", lookaheads)
-
-                if not exists(new_item, items):
-                    items.append(new_item)
-                    flag = 1
-
-        if not flag:
-            break
+            j = at[core]
+            added = lookaheads & ~merged[j].lookahead_bits
+            if added:
+                merged[j] = Item(prod, 0, merged[j].lookahead_bits | added)
+                pending[j] |= added
+                if not queued[j]:
+                    queued[j] = True
+                    work.append(j)
 
+    items[:] = merged
     return items
 
-def split_body_with_dot(body):
-    result = []
-    i = 0
-    while i < len(body):
-        if body[i] == '.':
-            result.append('.')
-            i += 1
-        elif body[i] == ' ':
-            i += 1  # ignora espacios extra
-        else:
-            sym = ''
-            while i < len(body) and body[i] not in ['.', ' ']:
-                sym += body[i]
-                i += 1
-            result.append(sym)
-    return result
-
-
 def pretty_print_items(items, codigos_equivalentes={}):
     for item in items:
-        # Remplaza '.' por '●' solo para mostrar
-        item_str = item.replace('.', '●').replace('→', '->')
+        # El punto se muestra como '●'
+        item_str = item.text('●', '->')
 
         # Reemplazar símbolos codificados por su forma legible
         if codigos_equivalentes:
@@ -128,10 +181,11 @@ def format_states(states, codigos_equivalentes={}):
         
         # Determine items list
         items = state.closure if hasattr(state, 'closure') else state
+        g = getattr(state, 'grammar', None)
         
         for item in items:
-            # Remplaza '.' por '●' solo para mostrar
-            item_str = item.replace('.', '●').replace('→', '->')
+            # El punto se muestra como '●'
+            item_str = item.text('●', '->', g)
 
             # Reemplazar símbolos codificados por su forma legible
             if codigos_equivalentes:
@@ -139,7 +193,7 @@ def format_states(states, codigos_equivalentes={}):
                     item_str = item_str.replace(codigo, texto)
             
             # Format lookaheads
-            lookaheads = item.lookahead
+            lookaheads = item.lookahead_names(g)
             # Join lookaheads with spaces or commas? The original printed one line per lookahead?
             # Original: for lookahead in item.lookahead: print(...)
             # Let's verify original logic.
@@ -153,280 +207,119 @@ def format_states(states, codigos_equivalentes={}):
     return "\n".join(output)
 
 
-def goto(items, symbol):
-    initial = []
-
-    for i in items:
-        head, body = i.split('→')
-        symbols = split_body_with_dot(body.strip())
-
-        if '.' not in symbols:
-            continue
+def goto_kernel(items, symbol):
+    # Núcleo de goto(items, symbol): los items con el punto movido, sin clausura
+    kernel = []
 
-        dot_pos = symbols.index('.')
+    g = firstandfollows.get_grammar()
+    sym = g.ids.get(symbol)
 
-        # Verificamos si hay símbolo después del punto
-        if dot_pos + 1 < len(symbols) and symbols[dot_pos + 1] == symbol:
+    for i in items:
+        # Verificamos si el símbolo después del punto es el buscado
+        if sym is not None and i.next_symbol(g) == sym:
             # Mover el punto a la derecha del símbolo actual
-            new_symbols = symbols[:dot_pos] + [symbol, '.'] + symbols[dot_pos + 2:]
-            new_body = ' '.join(new_symbols)
-            initial.append(Item(f"{head}→{new_body}", i.lookahead))
-
-    return closure(initial)
-
+            kernel.append(Item(i.prod, i.dot + 1, i.lookahead_bits))
 
+    return kernel
 
-def calc_states():
-    def contains(states, t):
+def goto(items, symbol):
+    return closure(goto_kernel(items, symbol))
 
-        for s in states:
-            if len(s) != len(t): continue
 
-            if sorted(s) == sorted(t):
-                for i in range(len(s)):
-                    if s[i].lookahead != t[i].lookahead: break
-                else:
-                    return True
 
-        return False
+def calc_states(kernel_only=False):
+    """
+    Canonical LR(1) collection as a list of State objects numbered 0..n-1.
+    Each state records its transitions in state.goto (symbol -> state number).
 
+    With kernel_only, states keep just their kernel items; state.closure is
+    expanded again on each access (table construction, display, PDF export),
+    trading some time for a much smaller automaton in memory.
+    """
     global nt_list, t_list
 
-    head, body = firstandfollows.production_list[0].split('→')
-
-    states = [closure([Item(head + '→.' + body, ['$'])])]
-
-    while True:
-        flag = 0
-        for s in states:
-
-            for e in nt_list + t_list:
-
-                t = goto(s, e)
-                if t == [] or contains(states, t): continue
-
-                states.append(t)
-                flag = 1
-
-        if not flag: break
+    g = firstandfollows.get_grammar()
+    # Los goto se prueban en el orden de nt_list + t_list (numeración estable)
+    order = {g.ids[name]: k for k, name in enumerate(nt_list + t_list) if name in g.ids}
+
+    # Estado inicial: clausura de [Z → . S, $]
+    State._id = 0
+    start = [Item(0, 0, ['$'])]
+    states = [State(None if kernel_only else closure(list(start)), start)]
+    # Núcleo -> número de estado. Dos estados son iguales sii sus núcleos lo son,
+    # porque la clausura solo agrega items con el punto al inicio
+    # (en CLR el núcleo incluye los lookaheads de cada item)
+    index = {frozenset(start): 0}
+    work = deque([0])  # Cada estado se expande una sola vez
+
+    while work:
+        s = states[work.popleft()]
+
+        # Un solo recorrido del estado arma los núcleos de todos sus goto,
+        # solo para los símbolos que aparecen después de un punto
+        # (en modo kernel_only la clausura se expande aquí y se descarta)
+        kernels = {}
+        for i in s.closure:
+            X = i.next_symbol(g)
+            if X in order:
+                kernels.setdefault(X, []).append(Item(i.prod, i.dot + 1, i.lookahead_bits))
+
+        for X in sorted(kernels, key=order.get):
+            kernel = kernels[X]
+            key = frozenset(kernel)
+            if key not in index:
+                index[key] = len(states)
+                states.append(State(None if kernel_only else closure(list(kernel)), kernel))
+                work.append(index[key])
+
+            # Transición registrada: las tablas la leen sin volver a calcular goto
+            s.goto[g.symbols[X]] = index[key]
 
     return states
 
 
 
-def getprodno(item):
-    head, body = item.split('→')
-    body_without_dot = body.replace('.', '').strip()
-    
-    for i, prod in enumerate(firstandfollows.production_list):
-        p_head, p_body = prod.split('→')
-        if p_head.strip() == head.strip() and p_body.strip() == body_without_dot:
-            return i
-    return -1
-
 def make_table(states):
+    """
+    LR(1) table as an lrtable.LRTable: reductions on each item's lookaheads.
+    Also used for LALR(1) and minimal LR(1) states.
+    """
     global nt_list, t_list
-    State._id = 0 # Reset for consistent numbering
 
-    def getstateno(t):
-        for s in states:
-            if len(s.closure) != len(t):
-                continue
-            if sorted(s.closure) == sorted(t):
-                for i in range(len(s.closure)):
-                    if s.closure[i].lookahead != t[i].lookahead:
-                        break
-                else:
-                    return s.no
-        return -1
+    # calc_states ya numera los estados 0..n-1 y registra sus transiciones
+    g = firstandfollows.get_grammar()
 
-    SLR_Table = OrderedDict()
-
-    # Crucial: Reset numbering and wrap only if needed
-    for i in range(len(states)):
-        if not isinstance(states[i], State):
-            states[i] = State(states[i])
-        else:
-            # Re-assign numbers if we want them to start from 0 every build
-            states[i].no = i # Or rely on State._id if we reconstructed them
-            # Actually, to be safe and consistent:
-            states[i].no = State._id
-            State._id += 1
+    table = lrtable.LRTable(g, len(states))
 
     for s in states:
-        SLR_Table[s.no] = OrderedDict()
-
         for item in s.closure:
-            head, body = item.split('→')
-            body_symbols = split_body_with_dot(body.strip())
-
-
-            if body_symbols == ['.']:  # Producción completamente reducida
-                for term in item.lookahead:
-                    if term not in SLR_Table[s.no].keys():
-                        SLR_Table[s.no][term] = {'r' + str(getprodno(item))}
-                    else:
-                        SLR_Table[s.no][term] |= {'r' + str(getprodno(item))}
-                continue
-
-            try:
-                dot_pos = body_symbols.index('.')
-            except ValueError:
-                raise ValueError(f"Producción inválida sin punto: {item}")
+            body = g.bodies[item.prod]
 
-            if dot_pos == len(body_symbols) - 1:
+            if item.dot == len(body):
                 # Punto al final (producción lista para reducir)
-                if getprodno(item) == 0:
-                    SLR_Table[s.no]['$'] = 'Aceptar'
+                if item.prod == 0:
+                    table.add_action(s.no, EOF, lrtable.ACCEPT)
                 else:
-                    for term in item.lookahead:
-                        if term not in SLR_Table[s.no].keys():
-                            SLR_Table[s.no][term] = {'r' + str(getprodno(item))}
-                        else:
-                            SLR_Table[s.no][term] |= {'r' + str(getprodno(item))}
-                continue
-
-            # Punto no al final: shift o goto
-            nextsym = body_symbols[dot_pos + 1]
-            t = goto(s.closure, nextsym)
-            if t != []:
-                if nextsym in t_list:
-                    if nextsym not in SLR_Table[s.no].keys():
-                        SLR_Table[s.no][nextsym] = {'s' + str(getstateno(t))}
-                    else:
-                        SLR_Table[s.no][nextsym] |= {'s' + str(getstateno(t))}
-                else:
-                    SLR_Table[s.no][nextsym] = str(getstateno(t))
+                    for term in bit_ids(item.lookahead_bits):
+                        table.add_action(s.no, term, lrtable.reduce(item.prod))
+
+        # Shift / goto: transiciones registradas por calc_states
+        for nextsym, target in s.goto.items():
+            sym = g.ids[nextsym]
+            if g.is_terminal(sym):
+                table.add_action(s.no, sym, lrtable.shift(target))
+            else:
+                table.set_goto(s.no, sym, target)
 
-    return SLR_Table
+    return table
 
 def parse(table, input_string):
     """
     Simulates CLR(1) parsng for the given input string.
-    Identical logic to LR(0)/SLR(1) parsing if the table is built correctly.
-    Supports both integer state IDs (CLR/LR0/SLR) and string state IDs (LALR).
+    Identical logic to LR(0)/SLR(1) parsing: runs lrtable.parse on the
+    LRTable built by make_table (CLR, LALR or minimal LR).
     """
-    # 1. Tokenize Input
-    tokens = input_string.strip().split()
-    tokens.append('$') # Append EOF
-    
-    # 2. Determine State Type from Table Keys
-    # LALR uses string keys like "36", others use ints like 0
-    first_key = list(table.keys())[0] if table else 0
-    use_string_states = isinstance(first_key, str)
-    
-    # Initialize Stacks
-    initial_state = "0" if use_string_states else 0
-    # Search for start state if it's not 0 or "0" (LALR "0" might be something else if sorted differently?)
-    # Usually state 0 is correct for start.
-    
-    state_stack = [initial_state]
-    symbol_stack = [] 
-    
-    steps = []
-    
-    cursor = 0
-    max_steps = 1000 # Safety break
-    step_count = 0
-    
-    accepted = False
-    
-    while step_count < max_steps:
-        current_state = state_stack[-1]
-        current_input = tokens[cursor]
-        
-        # Snapshot state
-        steps.append({
-            'stack': " ".join(map(str, state_stack)),
-            'symbols': " ".join(symbol_stack),
-            'input': " ".join(tokens[cursor:]),
-            'action': ""
-        })
-        
-        step_idx = len(steps) - 1
-        
-        row = table.get(current_state, {})
-        action_set = row.get(current_input)
-        
-        if not action_set:
-            steps[step_idx]['action'] = f"Error: No action for input '{current_input}' in state {current_state}"
-            return steps # Fail
-            
-        if isinstance(action_set, set):
-            action = list(action_set)[0]
-            if len(action_set) > 1:
-                steps[step_idx]['action'] = f"Conflict: {action_set}. Chose {action}"
-        else:
-            action = action_set 
-            
-        if action == 'Aceptar':
-            steps[step_idx]['action'] = "Accept"
-            accepted = True
-            break
-            
-        elif action.startswith('s'):
-            # SHIFT
-            next_state_raw = action[1:]
-            
-            if use_string_states:
-                next_state = str(next_state_raw)
-            else:
-                next_state = int(next_state_raw)
-                
-            steps[step_idx]['action'] = f"Shift {next_state}"
-            state_stack.append(next_state)
-            symbol_stack.append(current_input)
-            cursor += 1
-            
-        elif action.startswith('r'):
-            # REDUCE
-            prod_idx = int(action[1:])
-            production = firstandfollows.production_list[prod_idx]
-            head, body = production.split('→')
-            head = head.strip()
-            body = body.strip()
-            
-            # Handle Lambda
-            body_symbols = body.split()
-            if body in ['λ', 'ε', '']:
-                body_symbols = []
-            
-            count_to_pop = len(body_symbols)
-            
-            if count_to_pop > 0:
-                state_stack = state_stack[:-count_to_pop]
-                symbol_stack = symbol_stack[:-count_to_pop]
-            
-            # GOTO
-            top_state = state_stack[-1]
-            goto_row = table.get(top_state, {})
-            goto_state_raw = goto_row.get(head)
-            
-            if not goto_state_raw:
-                steps[step_idx]['action'] = f"Reduce {prod_idx} ({production}), but GOTO error on [{top_state}, {head}]"
-                return steps
-                
-            if isinstance(goto_state_raw, set):
-                 goto_val = list(goto_state_raw)[0]
-            else:
-                 goto_val = goto_state_raw
-            
-            if use_string_states:
-                goto_state = str(goto_val)
-            else:
-                goto_state = int(goto_val)
-                 
-            state_stack.append(goto_state)
-            symbol_stack.append(head)
-            steps[step_idx]['action'] = f"Reduce {prod_idx}: {production}"
-            
-        else:
-            steps[step_idx]['action'] = f"Unknown action: {action}"
-            return steps
-            
-        step_count += 1
-        
-    return steps
+    return lrtable.parse(table, input_string)
 
 def augment_grammar():
     for i in range(ord('Z'), ord('A') - 1, -1):
@@ -435,6 +328,7 @@ def augment_grammar():
             start_prod = firstandfollows.production_list[0]
             firstandfollows.production_list.insert(0, new_start + '→' + start_prod.split('→')[0])
             firstandfollows.nt_list[new_start] = firstandfollows.NonTerminal(new_start)
+            firstandfollows.compile_grammar()
             return
 
 import sys
@@ -505,10 +399,11 @@ def format_states(states, codigos_equivalentes={}, show_lambda=False, empty_symb
         
         # Determine items list
         items = state.closure if hasattr(state, 'closure') else state
+        g = getattr(state, 'grammar', None)
         
         for item in items:
-            # Remplaza '.' por '●' solo para mostrar
-            item_str = item.replace('.', '●').replace('→', '->')
+            # El punto se muestra como '●'
+            item_str = item.text('●', '->', g)
 
             # Reemplazar símbolos codificados por su forma legible
             if codigos_equivalentes:
@@ -532,7 +427,7 @@ def format_states(states, codigos_equivalentes={}, show_lambda=False, empty_symb
                 item_str = f"{lhs}-> {rhs}"
 
             # Format lookaheads
-            lookaheads = item.lookahead
+            lookaheads = item.lookahead_names(g)
             for lookahead in lookaheads:
                 lookahead_str = codigos_equivalentes.get(lookahead, lookahead) if codigos_equivalentes else lookahead
                 output.append(f"  [ {item_str}, {lookahead_str} ]")
@@ -558,9 +453,10 @@ def export_items_to_pdf(states, codigos_equivalentes, filename="items_clr1.pdf",
         y -= 16
 
         items = state.closure if hasattr(state, 'closure') else state
+        g = getattr(state, 'grammar', None)
         for item in items:
             # Preparar el string legible
-            item_str = item.replace(".", "●").replace("→", "->")
+            item_str = item.text('●', '->', g)
             for codigo, texto in codigos_equivalentes.items():
                 item_str = item_str.replace(codigo, texto)
 
@@ -576,7 +472,7 @@ def export_items_to_pdf(states, codigos_equivalentes, filename="items_clr1.pdf",
                             rhs = f"{empty_symbol} ●"
                 item_str = f"{lhs}-> {rhs}"
 
-            for la in item.lookahead:
+            for la in item.lookahead_names(g):
                 la_str = codigos_equivalentes.get(la, la)
                 line = f"[ {item_str}, {la_str} ]"
 
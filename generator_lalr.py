@@ -1,185 +1,173 @@
 
 import generator_clr
+import generator_lr
 import firstandfollows
+from grammar import EOF, bits
 from collections import OrderedDict, defaultdict
 
 class LALRState:
-    def __init__(self, states_to_merge):
+    def __init__(self, states_to_merge, signature):
         # states_to_merge: list of generator_clr.State
-        
-        # 1. Calculate combined ID
-        # Sort by ID ensures deterministic name "36", not "63"
+        # signature: frozenset de los cores del núcleo que comparten todos ellos
+        self.signature = signature
+
+        # 1. Original CLR states, by ID. original_ids maps the merged state
+        # back to them for display; its own number is assigned by
+        # calc_states_lalr_merge (dense 0..n-1, like every other automaton)
         self.sorted_states = sorted(states_to_merge, key=lambda s: s.no)
         self.original_ids = [s.no for s in self.sorted_states]
-        
-        # Name: concatenation of IDs
-        self.no = "".join(str(s.no) for s in self.sorted_states)
+        self.no = None
+        self.grammar = self.sorted_states[0].grammar
         
         # 2. Merge lookaheads
         self.closure = []
+        self.goto = OrderedDict()  # símbolo -> no del estado LALR destino (ver calc_states_lalr)
         
-        # Group items by their core string
-        core_map = defaultdict(set)
+        # Group items by their core (prod, dot)
+        core_map = defaultdict(int)  # core -> lookahead bitmask
         
         for state in self.sorted_states:
-            items = state.closure if hasattr(state, 'closure') else state
-            for item in items:
-                # Extract core text "A->alpha.beta"
-                # generator_clr.Item.__new__ stores the string.
-                # item is the string.
-                # However, iterating 'item' yields characters.
-                # We can't trust str(item) because it appends lookaheads.
-                # But we know `item` is a str subclass.
-                # Item slicing `item[:]` works to extract characters.
-                core_text = "".join(list(item))
-                
-                for la in item.lookahead:
-                    core_map[core_text].add(la)
+            for item in state.closure:
+                core_map[item.core] |= item.lookahead_bits
                     
         # Create new Items with merged lookaheads
-        for core, lookaheads in core_map.items():
-            new_item = generator_clr.Item(core, list(lookaheads))
+        for (prod, dot), lookaheads in core_map.items():
+            new_item = generator_clr.Item(prod, dot, lookaheads)
             self.closure.append(new_item)
 
 def calc_states_lalr():
-    # 1. Get CLR states (which are processed by generator_clr.calc_states)
-    # Note: generator_clr.calc_states might already return State objects or lists
-    clr_raw = generator_clr.calc_states()
-    
-    # Standardize to State objects
+    """
+    LALR(1) automaton computed directly from the LR(0) one (DeRemer &
+    Pennello): the LR(0) states and transitions are built once, and the
+    lookaheads come from the reads / includes / lookback relations solved
+    with firstandfollows.digraph. No canonical LR(1) state is ever built.
+    Gives the same tables as merging the CLR states by core
+    (calc_states_lalr_merge), with states numbered as in the LR(0) automaton.
+    """
+    lr0_states = generator_lr.calc_states(symbols=generator_clr.nt_list + generator_clr.t_list)
+    lookaheads = lalr_lookaheads(lr0_states)
+
     generator_clr.State._id = 0
-    clr_states = []
-    for s in clr_raw:
-        if not isinstance(s, generator_clr.State):
-            clr_states.append(generator_clr.State(s))
-        else:
-            # Re-id for consistency if already States
-            s.no = generator_clr.State._id
-            generator_clr.State._id += 1
-            clr_states.append(s)
-    
+    lalr_states = []
+    for s in lr0_states:
+        items = [generator_clr.Item(i.prod, i.dot, lookaheads.get((s.no, i.prod, i.dot), 0))
+                 for i in s.closure]
+        state = generator_clr.State(items, items[:len(s.kernel)])
+        state.goto.update(s.goto)
+        lalr_states.append(state)
+
+    return lalr_states
+
+def lalr_lookaheads(states):
+    """
+    LALR(1) lookahead mask of every item of an LR(0) automaton, as a dict
+    (state number, production, dot) -> terminal bitmask.
+
+    For each nonterminal transition (p, A):
+      DR(p, A)     terminals shifted right after it,
+      reads        (p, A) → (r, C) with r = goto(p, A) and C nullable,
+      includes     (p, A) → (p', B) for B → β A γ, γ nullable, p' --β--> p,
+    so Read = digraph(reads, DR) and Follow = digraph(includes, Read).
+    An item [A → α . β] in state q then gets the Follow of every (p', A)
+    with p' --α--> q (the lookback of the reduction when β is empty).
+    """
+    g = firstandfollows.get_grammar()
+    goto = [{g.ids[sym]: target for sym, target in s.goto.items()} for s in states]
+    trans = [(p, A) for p in range(len(states)) for A in goto[p] if g.is_nonterminal(A)]
+
+    DR = {}
+    reads = {}
+    for p, A in trans:
+        r = goto[p][A]
+        DR[(p, A)] = bits(X for X in goto[r] if g.is_terminal(X))
+        reads[(p, A)] = [(r, C) for C in goto[r] if g.is_nonterminal(C) and C in g.nullable]
+
+    # Z → . S: después del símbolo inicial solo puede venir el fin de cadena
+    start = g.bodies[0][0]
+    if (0, start) in DR:
+        DR[(0, start)] |= 1 << EOF
+    read = firstandfollows.digraph(trans, reads, DR)
+
+    # Recorrido de cada producción B → β desde cada transición (p', B)
+    includes = {x: [] for x in trans}
+    for p0, B in trans:
+        for prod in g.by_head[B]:
+            p = p0
+            for i, X in enumerate(g.bodies[prod]):
+                if g.is_nonterminal(X) and g.suffix_nullable[prod][i + 1]:
+                    includes[(p, X)].append((p0, B))
+                p = goto[p][X]
+    follow = firstandfollows.digraph(trans, includes, read)
+
+    # Mismo recorrido: cada item del camino recibe el Follow de la transición
+    lookaheads = defaultdict(int)
+    walks = [(0, 0, 1 << EOF)]  # Z → S no tiene transición propia
+    walks += [(p0, prod, follow[(p0, B)]) for p0, B in trans for prod in g.by_head[B]]
+    for p, prod, la in walks:
+        body = g.bodies[prod]
+        for dot in range(len(body) + 1):
+            lookaheads[(p, prod, dot)] |= la
+            if dot < len(body):
+                p = goto[p][body[dot]]
+    return lookaheads
+
+def calc_states_lalr_merge():
+    """
+    LALR(1) automaton by building the canonical LR(1) collection and merging
+    the states that share the same cores. Much slower than calc_states_lalr;
+    kept to cross-check it.
+    """
+    # 1. CLR states, numbered 0..n-1 by generator_clr.calc_states
+    clr_states = generator_clr.calc_states()
+
     # 3. Group by Core
+    # Firma: los cores del núcleo, calculada una sola vez por estado CLR
+    # (la clausura queda determinada por los cores del núcleo)
+    signatures = [frozenset(item.core for item in state.kernel) for state in clr_states]
     states_by_core = defaultdict(list)
-    
-    for state in clr_states:
-        items = state.closure
-        
-        # Signature: sorted list of core strings
-        cores = []
-        for item in items:
-             # Extract core text "A->alpha.beta"
-             # Since it's a generator_clr.Item, str(item) might have lookaheads.
-             # We use the list-casting trick or slice to get core text.
-             core_text = "".join(list(item))
-             cores.append(core_text)
-        
-        signature = tuple(sorted(cores))
+    for state, signature in zip(clr_states, signatures):
         states_by_core[signature].append(state)
-        
+
     # 4. Create LALR states
-    lalr_states = []
-    
+    by_signature = {}  # firma -> estado LALR
     for signature, group in states_by_core.items():
-        merged_state = LALRState(group)
-        lalr_states.append(merged_state)
+        by_signature[signature] = LALRState(group, signature)
 
-    # Sort by the first original ID for consistent ordering
-    lalr_states.sort(key=lambda s: s.original_ids[0])
-    
-    return lalr_states
-
-def make_table_lalr(states):
-    table = OrderedDict()
-    
-    # Helper: find LALR state by Core
-    def getstateno_lalr(target_closure):
-        # target_closure: list of Items
-        target_cores = sorted(["".join(list(itm)) for itm in target_closure])
-        
-        for s in states:
-            s_cores = sorted(["".join(list(itm)) for itm in s.closure])
-            if target_cores == s_cores:
-                return s.no
-        return -1
+    # Sort by the first original ID for consistent ordering, numbered 0..n-1
+    lalr_states = sorted(by_signature.values(), key=lambda s: s.original_ids[0])
+    for no, merged in enumerate(lalr_states):
+        merged.no = no
 
-    # Initialize Rows
-    for s in states:
-        table[s.no] = OrderedDict()
-        
-    for s in states:
-        # CALCULATE ACTIONS
-        for item in s.closure:
-            head, body = item.split('→')
-            symbols = generator_clr.split_body_with_dot(body.strip())
-            
-            if '.' in symbols and symbols.index('.') < len(symbols) - 1:
-                # SHIFT
-                dot_pos = symbols.index('.')
-                term = symbols[dot_pos + 1]
-                
-                if term in generator_clr.t_list:
-                    # GOTO using CLR check
-                    next_closure = generator_clr.goto(s.closure, term)
-                    next_id = getstateno_lalr(next_closure)
-                    
-                    if next_id != -1:
-                        action = f"s{next_id}"
-                        # Conflict Check
-                        if term in table[s.no]:
-                             prev = table[s.no][term]
-                             # Only add if distinct
-                             if str(action) != str(prev) and action not in prev:
-                                 if isinstance(prev, set):
-                                     prev.add(action)
-                                 else:
-                                     table[s.no][term] = {prev, action}
-                        else:
-                             table[s.no][term] = action
+    # 5. Transitions: every CLR state of a group has the same cores, so its
+    # recorded transitions lead to the same merged targets
+    for merged in lalr_states:
+        for sym, target in merged.sorted_states[0].goto.items():
+            merged.goto[sym] = by_signature[signatures[target]].no
 
-            elif '.' in symbols and symbols.index('.') == len(symbols) - 1:
-                 # REDUCE
-                 if head == list(firstandfollows.nt_list.keys())[0]: # Start Symbol
-                     for la in item.lookahead:
-                         if la == '$':
-                             table[s.no]['$'] = "Aceptar"
-                 else:
-                     prod_no = generator_clr.getprodno(item)
-                     for la in item.lookahead:
-                         action = f"r{prod_no}"
-                         if la in table[s.no]:
-                             prev = table[s.no][la]
-                             if str(action) != str(prev) and action not in prev: 
-                                 if isinstance(prev, set):
-                                     prev.add(action)
-                                 else:
-                                     table[s.no][la] = {prev, action}
-                         else:
-                             table[s.no][la] = action
-                             
-        # CALCULATE GOTO (NTs)
-        for nt in generator_clr.nt_list:
-            next_closure = generator_clr.goto(s.closure, nt)
-            if not next_closure: continue
-            
-            next_id = getstateno_lalr(next_closure)
-            if next_id != -1:
-                table[s.no][nt] = str(next_id)
+    return lalr_states
 
-    return table
+def make_table_lalr(states):
+    # Los estados LALR tienen la misma forma que los CLR (closure con
+    # lookaheads, goto, no 0..n-1): la tabla se arma igual
+    return generator_clr.make_table(states)
 
 def format_states(states, codigos_equivalentes={}, show_lambda=False, empty_symbol='λ'):
-    # Reuse generator_clr formatter, but handle LALR State ID (string) if needed
-    # generator_clr.format_states uses enumerate idx for ID.
-    # LALR states have custom IDs (s.no). 
-    # We should override or wrap it.
+    # Like generator_clr.format_states, with lookaheads merged by core.
+    # States merged from CLR ones (calc_states_lalr_merge) also list
+    # the original CLR ids.
     
     output = []
     for s in states:
-        output.append(f"State {s.no}:")
+        original_ids = getattr(s, 'original_ids', None)
+        if original_ids:
+            output.append(f"State {s.no} (CLR {', '.join(map(str, original_ids))}):")
+        else:
+            output.append(f"State {s.no}:")
         
         items = s.closure
+        g = s.grammar
         for item in items:
-            item_str = item.replace('.', '●').replace('→', '->')
+            item_str = item.text('●', '->', g)
             if codigos_equivalentes:
                 for cod, txt in codigos_equivalentes.items():
                     item_str = item_str.replace(cod, txt)
@@ -194,7 +182,7 @@ def format_states(states, codigos_equivalentes={}, show_lambda=False, empty_symb
                         else: rhs = f"{empty_symbol} ●"
                 item_str = f"{lhs}-> {rhs}"
 
-            lookaheads = item.lookahead
+            lookaheads = item.lookahead_names(g)
             for la in lookaheads:
                  la_str = codigos_equivalentes.get(la, la) if codigos_equivalentes else la
                  output.append(f"  [ {item_str}, {la_str} ]")
@@ -215,7 +203,6 @@ def export_items_to_pdf(states, filename="states_lalr1.pdf", show_lambda=False,
     c.setFont("Times-Roman", 12)
 
     for state in states:
-        # Use state.no (e.g. "36")
         titulo = f"Item{state.no}{{"
         
         if y < margin:
@@ -227,8 +214,9 @@ def export_items_to_pdf(states, filename="states_lalr1.pdf", show_lambda=False,
         y -= 16
         
         items = state.closure
+        g = state.grammar
         for item in items:
-            item_str = item.replace('.', '●').replace('→', '->')
+            item_str = item.text('●', '->', g)
             if codigos_equivalentes:
                 for cod, txt in codigos_equivalentes.items():
                     item_str = item_str.replace(cod, txt)
@@ -242,7 +230,7 @@ def export_items_to_pdf(states, filename="states_lalr1.pdf", show_lambda=False,
                         else: rhs = f"{empty_symbol} ●"
                 item_str = f"{lhs}-> {rhs}"
 
-            for la in item.lookahead:
+            for la in item.lookahead_names(g):
                 la_str = codigos_equivalentes.get(la, la) if codigos_equivalentes else la
                 line = f"[ {item_str}, {la_str} ]"
 
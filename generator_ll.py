@@ -10,25 +10,23 @@ def compute_ll1_table():
         dict: A dictionary representing the table {NonTerminal: {Terminal: ProductionIndex}}.
     """
     tabla = defaultdict(dict)
+    g = firstandfollows.get_grammar()
 
-    for i, prod in enumerate(firstandfollows.production_list):
-        head, body = prod.split("→")
-        head = head.strip()
-        body_syms = body.strip().split()
+    for i, head in enumerate(g.heads):
+        name = g.symbols[head]
 
-        # Calculate First(body)
-        first = firstandfollows.compute_first_sequence(body_syms)
+        # First(body) comes precomputed from the suffix table
+        first = g.suffix_first[i][0]
 
         # Rule 1: For each terminal 'a' in First(beta), add A->beta to M[A, a]
-        for t in first - {LAMBDA}:
-            tabla[head][t] = i
+        for t in g.mask_names(first):
+            tabla[name][t] = i
 
         # Rule 2: If epsilon in First(beta), add A->beta to M[A, b] for each b in Follow(A)
         # Also, if epsilon in First(beta) and $ in Follow(A), add A->beta to M[A, $]
-        if LAMBDA in first:
-            follow = firstandfollows.get_siguiente(head)
-            for f in follow:
-                tabla[head][f] = i
+        if g.suffix_nullable[i][0]:
+            for f in g.mask_names(g.follow[head]):
+                tabla[name][f] = i
 
     return dict(tabla)
 
@@ -59,6 +57,7 @@ def parse_input(table, start_symbol, input_tokens):
     if start_symbol not in firstandfollows.nt_list:
         return f"Error: Start symbol '{start_symbol}' not found.", []
 
+    g = firstandfollows.get_grammar()
     root = TreeNode(start_symbol)
     stack_nodes = [None, root] # Parallel stack for tree nodes
     
@@ -103,14 +102,13 @@ def parse_input(table, start_symbol, input_tokens):
             
             step_entry["action"] = f"{prod}" # Simplified action: just the production
             
-            head, body = prod.split("→")
-            body_syms = body.strip().split()
+            body_syms = g.names(g.bodies[prod_idx])
             
             stack.pop()
             stack_nodes.pop()
             
             children = []
-            if body_syms == [LAMBDA]:
+            if not body_syms:
                 child = TreeNode(LAMBDA)
                 children.append(child)
             else:
@@ -119,7 +117,7 @@ def parse_input(table, start_symbol, input_tokens):
             
             current_node.children = children
             
-            if body_syms != [LAMBDA]:
+            if body_syms:
                 for i in range(len(body_syms) - 1, -1, -1):
                     stack.append(body_syms[i])
                     stack_nodes.append(children[i])
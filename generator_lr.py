@@ -1,5 +1,7 @@
 from collections import deque, OrderedDict
 import firstandfollows
+import lrtable
+from grammar import EOF, bit_ids
 
 
 # Added for Parse Tree Simulation
@@ -16,115 +18,111 @@ LAMBDA = 'λ'
 class State:
     _id = 0
 
-    def __init__(self, closure):
-        self.closure = closure
+    def __init__(self, closure=None, kernel=None):
+        # Sin closure (modo kernel_only de calc_states) solo se guarda el
+        # núcleo y la clausura se vuelve a expandir cada vez que se pide
+        self._closure = closure
+        self.kernel = kernel
         self.no = State._id
+        self.goto = OrderedDict()  # símbolo -> número del estado destino
+        # Gramática con la que se construyó: sus items se muestran con ella
+        # aunque después se compile otra
+        self.grammar = firstandfollows.get_grammar()
         State._id += 1
 
+    @property
+    def closure(self):
+        if self._closure is None:
+            return closure(list(self.kernel), self.grammar)
+        return self._closure
 
-class Item(str):
-    def __new__(cls, item, lookahead=list()):
-        if '.' not in item:
-            raise ValueError(f"Item mal formado, sin '.': {item}")
-        self = str.__new__(cls, item)
-        # Lookaheads are IGNORED for LR(0) identity
-        self.lookahead = [] 
-        return self
+    @closure.setter
+    def closure(self, items):
+        self._closure = items
 
-    def __str__(self):
-        return super(Item, self).__str__()
 
+class Item:
+    """
+    LR(0) item as a position in the compiled grammar: production index plus
+    dot position. The symbol after the dot is g.bodies[prod][dot]; the text
+    form is only built for display (see text()).
+    """
+    __slots__ = ('prod', 'dot')
 
+    def __init__(self, prod, dot=0):
+        self.prod = prod
+        self.dot = dot
 
-def closure(items):
-    def exists(newitem, items):
-        # Only check the core item string since lookaheads are gone
-        for i in items:
-            if i == newitem:
-                return True
-        return False
+    @property
+    def core(self):
+        return (self.prod, self.dot)
 
-    global production_list
+    def next_symbol(self, g):
+        # Id del símbolo después del punto, None si el punto está al final
+        body = g.bodies[self.prod]
+        return body[self.dot] if self.dot < len(body) else None
 
-    while True:
-        flag = 0
-        for i in items:
-            head, body = i.split('→')
-            symbols = split_body_with_dot(body.strip())
+    def text(self, dot='.', arrow='→', g=None):
+        # g: gramática de los ids (por defecto la actual, ver State.grammar)
+        if g is None:
+            g = firstandfollows.get_grammar()
+        names = g.names(g.bodies[self.prod])
+        return g.symbols[g.heads[self.prod]] + arrow + ' '.join(names[:self.dot] + [dot] + names[self.dot:])
 
-            if '.' not in symbols or symbols.index('.') == len(symbols) - 1:
-                continue
+    def __str__(self):
+        return self.text()
 
-            dot_pos = symbols.index('.')
-            B = symbols[dot_pos + 1]  # símbolo después del punto
+    def __repr__(self):
+        return f"Item({self.text()!r})"
 
-            if B not in nt_list:
-                continue
-            
-            # LR(0): We DO NOT compute lookaheads from beta + la
+    def __eq__(self, other):
+        return isinstance(other, Item) and self.prod == other.prod and self.dot == other.dot
 
-            for prod in firstandfollows.production_list:
-                lhs, rhs = prod.split('→')
-                if lhs.strip() != B:
-                    continue
+    def __hash__(self):
+        return hash((self.prod, self.dot))
 
-                rhs_symbols = rhs.strip().split()
-                new_body = '. ' + ' '.join(rhs_symbols)
-                new_item = Item(f"{B}→{new_body}", []) # Empty lookahead
 
-                if not exists(new_item, items):
-                    items.append(new_item)
-                    flag = 1
 
-        if not flag:
-            break
+def closure(items, g=None):
+    if g is None:
+        g = firstandfollows.get_grammar()
+    nt_closure = firstandfollows.lr0_closures(g)
 
-    return items
+    # Cerrar un núcleo es unir las clausuras precalculadas de cada
+    # no terminal que aparece después de un punto
+    seen = set(items)
+    done = set()
+    for i in list(items):
+        B = i.next_symbol(g)  # símbolo después del punto
 
-def split_body_with_dot(body):
-    result = []
-    i = 0
-    while i < len(body):
-        if body[i] == '.':
-            result.append('.')
-            i += 1
-        elif body[i] == ' ':
-            i += 1  # ignora espacios extra
-        else:
-            sym = ''
-            while i < len(body) and body[i] not in ['.', ' ']:
-                sym += body[i]
-                i += 1
-            result.append(sym)
-    
-    # Filter out Lambda/Epsilon from the result to treat them as empty
-    # But keep '.'
-    # The generator uses 'λ' (from code constant/string)
-    LAMBDA_SYMBOLS = ['λ', 'ε']
-    filtered_result = [x for x in result if x not in LAMBDA_SYMBOLS]
-    
-    # Special case: If the body was JUST lambda/epsilon (now empty), we have [].
-    # But we might have the dot.
-    # If original was "A -> . λ", split gives ['.', 'λ']. Filtered gives ['.'].
-    # If original was "A -> λ .", split gives ['λ', '.']. Filtered gives ['.']. 
-    # This correctly reduces to "A -> ." 
-    
-    return filtered_result
+        if B is None or not g.is_nonterminal(B) or B in done:
+            continue
+        done.add(B)
+        
+        # LR(0): We DO NOT compute lookaheads from beta + la
+
+        for prod in nt_closure[B]:
+            new_item = Item(prod, 0)
+
+            if new_item not in seen:
+                seen.add(new_item)
+                items.append(new_item)
+
+    return items
 
 
 def pretty_print_items(items, codigos_equivalentes={}):
     for item in items:
-        # Remplaza '.' por '●' solo para mostrar
-        item_str = item.replace('.', '●').replace('→', '->')
+        # El punto se muestra como '●'
+        item_str = item.text('●', '->')
 
         # Reemplazar símbolos codificados por su forma legible
         if codigos_equivalentes:
             for codigo, texto in codigos_equivalentes.items():
                 item_str = item_str.replace(codigo, texto)
 
-        for lookahead in item.lookahead:
-            lookahead_str = codigos_equivalentes.get(lookahead, lookahead) if codigos_equivalentes else lookahead
-            print(f"[ {item_str}, {lookahead_str} ]")
+        # LR(0): sin lookaheads
+        print(f"[ {item_str} ]")
 
 def format_states_lr0(states, codigos_equivalentes={}, show_lambda=False, empty_symbol='λ'):
     result = []
@@ -132,19 +130,11 @@ def format_states_lr0(states, codigos_equivalentes={}, show_lambda=False, empty_
         result.append(f"Item{idx}{{")
         # Ensure we can handle State objects or raw lists
         items = state.closure if hasattr(state, 'closure') else state
+        g = getattr(state, 'grammar', None)
         for item in items:
              
-             head, body = item.split('→')
-             
-             # Sanitize body for display: Remove internal λ/ε if present
-             for bad_sym in ['λ', 'ε']:
-                 body = body.replace(bad_sym, "")
-             
-             # Handle dot and arrow
-             body_display = body.replace('.', '●').strip()
-             
-             # If logic led to space issues, clean up multiple spaces
-             body_display = " ".join(body_display.split())
+             # λ/ε ya no aparecen en los cuerpos compilados
+             head, body_display = item.text('●', g=g).split('→', 1)
              
              # Logic to show Lambda/Epsilon if body is effectively empty (only dot) and show_lambda is True
              if body_display.replace('●', '').strip() == "":
@@ -163,272 +153,144 @@ def format_states_lr0(states, codigos_equivalentes={}, show_lambda=False, empty_
     return "\n".join(result)
 
 
-def goto(items, symbol):
-    initial = []
-
-    for i in items:
-        head, body = i.split('→')
-        symbols = split_body_with_dot(body.strip())
+def goto_kernel(items, symbol):
+    # Núcleo de goto(items, symbol): los items con el punto movido, sin clausura
+    kernel = []
 
-        if '.' not in symbols:
-            continue
-
-        dot_pos = symbols.index('.')
+    g = firstandfollows.get_grammar()
+    sym = g.ids.get(symbol)
 
-        # Verificamos si hay símbolo después del punto
-        if dot_pos + 1 < len(symbols) and symbols[dot_pos + 1] == symbol:
+    for i in items:
+        # Verificamos si el símbolo después del punto es el buscado
+        if sym is not None and i.next_symbol(g) == sym:
             # Mover el punto a la derecha del símbolo actual
-            new_symbols = symbols[:dot_pos] + [symbol, '.'] + symbols[dot_pos + 2:]
-            new_body = ' '.join(new_symbols)
-            initial.append(Item(f"{head}→{new_body}", i.lookahead))
+            kernel.append(Item(i.prod, i.dot + 1))
 
-    return closure(initial)
+    return kernel
 
+def goto(items, symbol):
+    return closure(goto_kernel(items, symbol))
 
 
-def calc_states():
-    def contains(states, t):
-
-        for s in states:
-            if len(s) != len(t): continue
-
-            if sorted(s) == sorted(t):
-                # For LR(0), we only care about core items (lookaheads are ignored)
-                return True
-                
-                # Original CLR logic for reference:
-                # for i in range(len(s)):
-                #     if s[i].lookahead != t[i].lookahead: break
-                # else:
-                #     return True
 
-        return False
+def calc_states(kernel_only=False, symbols=None):
+    """
+    Canonical LR(0) collection as a list of State objects numbered 0..n-1.
+    Each state records its transitions in state.goto (symbol -> state number).
+    Transitions are tried in the order of symbols (default nt_list + t_list).
 
+    With kernel_only, states keep just their kernel items; state.closure is
+    expanded again on each access (table construction, display, PDF export),
+    trading some time for a much smaller automaton in memory.
+    """
     global nt_list, t_list
 
-    head, body = firstandfollows.production_list[0].split('→')
-
-    states = [closure([Item(head + '→.' + body, [])])]
-
-    while True:
-        flag = 0
-        for s in states:
-
-            for e in nt_list + t_list:
-
-                t = goto(s, e)
-                if t == [] or contains(states, t): continue
-
-                states.append(t)
-                flag = 1
-
-        if not flag: break
+    g = firstandfollows.get_grammar()
+    # Los goto se prueban en el orden de nt_list + t_list (numeración estable)
+    if symbols is None:
+        symbols = nt_list + t_list
+    order = {g.ids[name]: k for k, name in enumerate(symbols) if name in g.ids}
+
+    # Estado inicial: clausura de Z → . S (producción 0 de la gramática aumentada)
+    State._id = 0
+    start = [Item(0, 0)]
+    states = [State(None if kernel_only else closure(list(start)), start)]
+    # Núcleo -> número de estado. Dos estados son iguales sii sus núcleos lo son,
+    # porque la clausura solo agrega items con el punto al inicio
+    index = {frozenset(start): 0}
+    work = deque([0])  # Cada estado se expande una sola vez
+
+    while work:
+        s = states[work.popleft()]
+
+        # Un solo recorrido del estado arma los núcleos de todos sus goto,
+        # solo para los símbolos que aparecen después de un punto
+        # (en modo kernel_only la clausura se expande aquí y se descarta)
+        kernels = {}
+        for i in s.closure:
+            X = i.next_symbol(g)
+            if X in order:
+                kernels.setdefault(X, []).append(Item(i.prod, i.dot + 1))
+
+        for X in sorted(kernels, key=order.get):
+            kernel = kernels[X]
+            key = frozenset(kernel)
+            if key not in index:
+                index[key] = len(states)
+                states.append(State(None if kernel_only else closure(list(kernel)), kernel))
+                work.append(index[key])
+
+            # Transición registrada: las tablas la leen sin volver a calcular goto
+            s.goto[g.symbols[X]] = index[key]
 
     return states
 
 
 def make_table(states):
+    """
+    LR(0) table as an lrtable.LRTable (see LRTable.rows() for the display form).
+    """
     global nt_list, t_list
+    g = firstandfollows.get_grammar()
 
-    def getstateno(t):
-        for s in states:
-            if len(s.closure) != len(t):
-                continue
-            if sorted(s.closure) == sorted(t):
-                for i in range(len(s.closure)):
-                    if s.closure[i].lookahead != t[i].lookahead:
-                        break
-                else:
-                    return s.no
-        return -1
-
-    def getprodno(item):
-        head, body = item.split('→')
-        body_without_dot = body.replace('.', '').strip()
-        clean = head.strip() + '→' + body_without_dot
-        for i, prod in enumerate(firstandfollows.production_list):
-            if prod.strip() == clean:
-                return i
-        return -1
-
-    SLR_Table = OrderedDict()
-
-    for i in range(len(states)):
-        states[i] = State(states[i])  # Asigna números de estado
+    table = lrtable.LRTable(g, len(states))
 
     for s in states:
-        SLR_Table[s.no] = OrderedDict()
-
         for item in s.closure:
-            head, body = item.split('→')
-            body_symbols = split_body_with_dot(body.strip())
-
+            body = g.bodies[item.prod]
 
-            if body_symbols == ['.']:  # Producción completamente reducida
-                # LR(0): Reduce on ALL terminals (including $)
-                for term in t_list:
-                    if term not in SLR_Table[s.no].keys():
-                        SLR_Table[s.no][term] = {'r' + str(getprodno(item))}
-                    else:
-                        SLR_Table[s.no][term] |= {'r' + str(getprodno(item))}
-                continue
-
-            try:
-                dot_pos = body_symbols.index('.')
-            except ValueError:
-                raise ValueError(f"Producción inválida sin punto: {item}")
-
-            if dot_pos == len(body_symbols) - 1:
+            if item.dot == len(body):
                 # Punto al final (producción lista para reducir)
-                if getprodno(item) == 0:
-                    SLR_Table[s.no]['$'] = 'Aceptar'
+                if item.prod == 0:
+                    table.add_action(s.no, EOF, lrtable.ACCEPT)
                 else:
-                    # LR(0): Reduce on ALL terminals
-                    for term in t_list:
-                        if term not in SLR_Table[s.no].keys():
-                            SLR_Table[s.no][term] = {'r' + str(getprodno(item))}
-                        else:
-                            SLR_Table[s.no][term] |= {'r' + str(getprodno(item))}
-                continue
+                    # LR(0): Reduce on ALL terminals (including $)
+                    for term in g.terminals:
+                        table.add_action(s.no, term, lrtable.reduce(item.prod))
 
-            # Punto no al final: shift o goto
-            nextsym = body_symbols[dot_pos + 1]
-            t = goto(s.closure, nextsym)
-            if t != []:
-                if nextsym in t_list:
-                    if nextsym not in SLR_Table[s.no].keys():
-                        SLR_Table[s.no][nextsym] = {'s' + str(getstateno(t))}
-                    else:
-                        SLR_Table[s.no][nextsym] |= {'s' + str(getstateno(t))}
-                else:
-                    SLR_Table[s.no][nextsym] = str(getstateno(t))
+        # Shift / goto: transiciones registradas por calc_states
+        add_transitions(table, s, g)
 
-    return SLR_Table
+    return table
 
 def make_table_slr(states):
+    """
+    SLR(1) table as an lrtable.LRTable: reductions only on Follow(head).
+    """
     global nt_list, t_list
-    
-    # 1. State Object Conversion
-    for i in range(len(states)):
-        if not isinstance(states[i], State):
-            states[i] = State(states[i])
-
-    def getstateno(t):
-        for s in states:
-            if len(s.closure) != len(t):
-                continue
-            s_set = set(str(x) for x in s.closure)
-            t_set = set(str(x) for x in t)
-            if s_set == t_set:
-                 return s.no
-        return -1
-
-    def getprodno(item):
-        """
-        Robustly finds production index by comparing token lists,
-        ignoring whitespace differences.
-        """
-        item_head, item_body = item.split('→')
-        # Remove dot and excess whitespace
-        item_body_clean = item_body.replace('.', ' ').strip()
-        item_tokens = item_body_clean.split()
-        
-        # Handle Lambda/Epsilon in item body if it was purely that
-        # (Though usually formatted items keep their structure)
-        
-        item_head = item_head.strip()
-        
-        for i, prod in enumerate(firstandfollows.production_list):
-            prod_head, prod_body = prod.split('→')
-            prod_tokens = prod_body.strip().split()
-            
-            if item_head == prod_head.strip() and item_tokens == prod_tokens:
-                return i
-        return -1
-
-    Table = OrderedDict()
+    g = firstandfollows.get_grammar()
 
-    # Initialize Table Rows
-    for s in states:
-        Table[s.no] = OrderedDict()
+    table = lrtable.LRTable(g, len(states))
 
     for s in states:
         for item in s.closure:
-            head, body = item.split('→')
-            body_symbols = split_body_with_dot(body.strip())
-
-            # CASE 1: Reduce checks
-            # Logic: If dot is last, or body became only '.' (from A->. or A->.λ)
-            
-            # Check effectively if it is a reduce item
-            # We can check if 'dot' is at the end of the filtered symbols
-            is_reduce = False
-            if body_symbols == ['.']: 
-                is_reduce = True
-            elif '.' in body_symbols and body_symbols.index('.') == len(body_symbols) - 1:
-                is_reduce = True
-                
-            if is_reduce:
-                prod_idx = getprodno(item)
-                
-                if prod_idx == -1:
-                    print(f"Warning: Could not find production for item {item}")
-                    continue
+            body = g.bodies[item.prod]
+
+            # CASE 1: Reduce (dot at the end, A → . for empty bodies)
+            if item.dot == len(body):
+                prod_idx = item.prod
 
                 if prod_idx == 0:
                     # Accept State: S' -> S .
-                    Table[s.no]['$'] = 'Aceptar'
+                    table.add_action(s.no, EOF, lrtable.ACCEPT)
                 else:
                     # SLR(1) Logic: Reduce only on Follow(Head)
-                    follow_set = firstandfollows.get_siguiente(head.strip())
-                    
-                    if not follow_set:
-                        # Should not happen for reachable non-terminals, but safety check
-                        continue
-
-                    for term in follow_set:
-                        if term not in Table[s.no].keys():
-                            Table[s.no][term] = {'r' + str(prod_idx)}
-                        else:
-                            val = Table[s.no][term]
-                            if isinstance(val, set):
-                                val.add('r' + str(prod_idx))
-                            else:
-                                Table[s.no][term] = {val, 'r' + str(prod_idx)}
-                continue
+                    for term in bit_ids(g.follow[g.heads[prod_idx]]):
+                        table.add_action(s.no, term, lrtable.reduce(prod_idx))
 
-            # CASE 2: Shift or Goto
-            try:
-                if '.' in body_symbols:
-                    dot_pos = body_symbols.index('.')
-                    if dot_pos + 1 < len(body_symbols):
-                        nextsym = body_symbols[dot_pos + 1]
-                        
-                        t = goto(s.closure, nextsym)
-                        if t != []:
-                            next_state_id = getstateno(t)
-                            
-                            if nextsym in t_list:
-                                # SHIFT
-                                action = 's' + str(next_state_id)
-                                if nextsym not in Table[s.no].keys():
-                                    Table[s.no][nextsym] = {action}
-                                else:
-                                     val = Table[s.no][nextsym]
-                                     if isinstance(val, set):
-                                         val.add(action)
-                                     else:
-                                         Table[s.no][nextsym] = {val, action}
-                            else:
-                                # GOTO
-                                Table[s.no][nextsym] = str(next_state_id)
-                        
-            except ValueError:
-                 pass
-            except IndexError:
-                 pass
-                 
-    return Table
+        # CASE 2: Shift or Goto, from the transitions recorded by calc_states
+        add_transitions(table, s, g)
+
+    return table
+
+def add_transitions(table, s, g):
+    # Shift para terminales, goto para no terminales
+    for nextsym, target in s.goto.items():
+        sym = g.ids[nextsym]
+        if g.is_terminal(sym):
+            table.add_action(s.no, sym, lrtable.shift(target))
+        else:
+            table.set_goto(s.no, sym, target)
 
 
 def augment_grammar():
@@ -438,6 +300,7 @@ def augment_grammar():
             start_prod = firstandfollows.production_list[0]
             firstandfollows.production_list.insert(0, new_start + '→' + start_prod.split('→')[0])
             firstandfollows.nt_list[new_start] = firstandfollows.NonTerminal(new_start)
+            firstandfollows.compile_grammar()
             return
 
 import sys
@@ -514,7 +377,7 @@ def main():
     ctr = 0
     for idx, state in enumerate(j):
         print(f"Item{idx}{{")  # ACA SER CAMBIA EL ITEM POR I SI QUIERES
-        pretty_print_items(state, codigos_equivalentes)
+        pretty_print_items(state.closure, codigos_equivalentes)
         print("}\n")
 
     table = make_table(j)
@@ -523,7 +386,7 @@ def main():
 
     sr, rr = 0, 0
 
-    for i, fila in table.items():
+    for i, fila in table.rows().items():
         print(i, "\t", fila)
         shift_count, reduce_count = 0, 0
 
@@ -632,15 +495,9 @@ def export_lr0_items_to_pdf(states, filename="states_lr0.pdf", show_lambda=False
         c.drawString(margin, y, titulo)
         y -= 16
 
+        g = getattr(state, 'grammar', None)
         for item in (state.closure if hasattr(state, 'closure') else state):
-             head, body = item.split('→')
-             
-             # Sanitize
-             for bad_sym in ['λ', 'ε']:
-                 body = body.replace(bad_sym, "")
-             
-             body_display = body.replace('.', '●').strip()
-             body_display = " ".join(body_display.split())
+             head, body_display = item.text('●', g=g).split('→', 1)
              
              if body_display.replace('●', '').strip() == "":
                  if show_lambda:
@@ -674,8 +531,9 @@ def export_lr0_items_to_pdf(states, filename="states_lr0.pdf", show_lambda=False
 
 def parse(table, input_string):
     """
-    Simulates LR(0) parsing for the given input string.
-    Returns a list of steps, where each step is a dict:
+    Simulates LR(0) parsing for the given input string on an lrtable.LRTable
+    (the same driver serves every LR table). Returns a list of steps, where
+    each step is a dict:
     {
         'stack': str,   # State Stack
         'symbols': str, # Symbol Stack
@@ -683,132 +541,7 @@ def parse(table, input_string):
         'action': str   # Action Taken
     }
     """
-    global production_list
-    
-    # 1. Tokenize Input
-    tokens = input_string.strip().split()
-    tokens.append('$') # Append EOF
-    
-    # 2. Initialize Stacks
-    state_stack = [0]
-    symbol_stack = [] # Removed '$' as requested by user
-    
-    steps = []
-    
-    cursor = 0
-    max_steps = 1000 # Safety break
-    step_count = 0
-    
-    accepted = False
-    
-    while step_count < max_steps:
-        current_state = state_stack[-1]
-        current_input = tokens[cursor]
-        
-        # Snapshot state
-        steps.append({
-            'stack': " ".join(map(str, state_stack)),
-            'symbols': " ".join(symbol_stack),
-            'input': " ".join(tokens[cursor:]),
-            'action': ""
-        })
-        
-        step_idx = len(steps) - 1
-        
-        # Look up action
-        # Table format: table[state_id][symbol] = {'sN'} or {'rN'} or 'Aceptar'
-        
-        row = table.get(current_state, {})
-        action_set = row.get(current_input)
-        
-        if not action_set:
-            steps[step_idx]['action'] = f"Error: No action for input '{current_input}' in state {current_state}"
-            return steps # Fail
-            
-        # Resolve Set
-        # If conflict, we just take the first one for simulation purposes or error
-        if isinstance(action_set, set):
-            action = list(action_set)[0]
-            if len(action_set) > 1:
-                steps[step_idx]['action'] = f"Conflict: {action_set}. Chose {action}"
-        else:
-            action = action_set # Could be 'Aceptar' string directly based on logic
-            
-        # Execute Action
-        if action == 'Aceptar':
-            steps[step_idx]['action'] = "Accept"
-            accepted = True
-            break
-            
-        elif action.startswith('s'):
-            # SHIFT
-            next_state = int(action[1:])
-            
-            steps[step_idx]['action'] = f"Shift {next_state}"
-            
-            state_stack.append(next_state)
-            symbol_stack.append(current_input)
-            cursor += 1
-            
-        elif action.startswith('r'):
-            # REDUCE
-            prod_idx = int(action[1:])
-            production = production_list[prod_idx]
-            lhs, rhs = production.split('→')
-            lhs = lhs.strip()
-            rhs_body = rhs.strip()
-            
-            # Determine RHS length (beta)
-            # Handle Lambda/Epsilon
-            rhs_symbols = []
-            if rhs_body not in ['λ', 'ε', '']:
-                 rhs_symbols = rhs_body.split()
-            
-            count_to_pop = len(rhs_symbols)
-            
-            # Pop from stacks
-            if count_to_pop > 0:
-                state_stack = state_stack[:-count_to_pop]
-                symbol_stack = symbol_stack[:-count_to_pop]
-            
-            # Note: Do not advance cursor
-            
-            # GOTO
-            top_state = state_stack[-1]
-            goto_row = table.get(top_state, {})
-            goto_state_raw = goto_row.get(lhs)
-            
-            if not goto_state_raw:
-                steps[step_idx]['action'] = f"Reduce {prod_idx} ({production}), but GOTO error on [{top_state}, {lhs}]"
-                return steps
-                
-            # Goto could be a set or string/int depending on how make_table saves NTs
-            # In make_table: SLR_Table[s.no][nextsym] = str(getstateno(t)) (string)
-            if isinstance(goto_state_raw, set):
-                 goto_state = int(list(goto_state_raw)[0])
-            else:
-                 goto_state = int(goto_state_raw)
-                 
-            state_stack.append(goto_state)
-            symbol_stack.append(lhs)
-            
-            steps[step_idx]['action'] = f"Reduce {prod_idx}: {production}"
-            
-        else:
-            steps[step_idx]['action'] = f"Unknown action: {action}"
-            return steps
-            
-        step_count += 1
-        
-    if not accepted and step_count >= max_steps:
-         steps.append({
-            'stack': "...",
-            'symbols': "...",
-            'input': "...",
-            'action': "Terminated: Max steps reached"
-        })
-        
-    return steps
+    return lrtable.parse(table, input_string)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,125 @@
+
+import generator_clr
+import generator_lr
+import firstandfollows
+from grammar import EOF
+from collections import deque
+
+def weakly_compatible(a, b):
+    """
+    Pager's weak compatibility of two LR(1) kernels with the same cores,
+    given as dicts core -> lookahead bitmask. For every pair of cores i, j
+    the merge is safe if it cannot mix their lookaheads (La[i] ∩ Lb[j] and
+    Lb[i] ∩ La[j] empty) or if i and j already share a lookahead in one of
+    the two kernels. Merging compatible kernels never adds a reduce/reduce
+    conflict that the canonical LR(1) automaton does not have.
+    """
+    cores = list(a)
+    for x, i in enumerate(cores):
+        for j in cores[x + 1:]:
+            if (a[i] & b[j]) or (b[i] & a[j]):
+                if not (a[i] & a[j]) and not (b[i] & b[j]):
+                    return False
+    return True
+
+def calc_states_pager():
+    """
+    Minimal LR(1) automaton (Pager's PGM): the canonical LR(1) construction,
+    but a new kernel is merged into an existing state with the same cores
+    whenever the two are weakly compatible. A state whose lookaheads grow is
+    expanded again so its successors get them too. State counts are close
+    to LALR(1) while conflicts stay those of CLR(1).
+
+    Returns generator_clr.State objects numbered 0..n-1, so generator_clr's
+    make_table, parse and format_states work on them unchanged.
+    """
+    g = firstandfollows.get_grammar()
+    # Los goto se prueban en el orden de nt_list + t_list (numeración estable)
+    order = {g.ids[name]: k for k, name in enumerate(generator_clr.nt_list + generator_clr.t_list)
+             if name in g.ids}
+
+    # Núcleo de cada estado: core -> máscara de lookaheads, [Z → . S, $] al inicio
+    kernels = [{(0, 0): 1 << EOF}]
+    gotos = [{}]
+    by_core = {frozenset(kernels[0]): [0]}  # Estados con los mismos cores
+    work = deque([0])
+    queued = {0}
+
+    while work:
+        s = work.popleft()
+        queued.discard(s)
+
+        items = generator_clr.closure([generator_clr.Item(prod, dot, la)
+                                       for (prod, dot), la in kernels[s].items()])
+        successors = {}
+        for i in items:
+            X = i.next_symbol(g)
+            if X in order:
+                kernel = successors.setdefault(X, {})
+                core = (i.prod, i.dot + 1)
+                kernel[core] = kernel.get(core, 0) | i.lookahead_bits
+
+        # Al volver a expandir un estado sus transiciones se recalculan
+        gotos[s] = {}
+        for X in sorted(successors, key=order.get):
+            kernel = successors[X]
+            key = frozenset(kernel)
+            for t in by_core.get(key, ()):
+                if weakly_compatible(kernels[t], kernel):
+                    break
+            else:
+                t = None
+
+            if t is None:
+                t = len(kernels)
+                kernels.append(kernel)
+                gotos.append({})
+                by_core.setdefault(key, []).append(t)
+                work.append(t)
+                queued.add(t)
+            else:
+                grown = False
+                for core, la in kernel.items():
+                    if la & ~kernels[t][core]:
+                        kernels[t][core] |= la
+                        grown = True
+                if grown and t not in queued:
+                    work.append(t)
+                    queued.add(t)
+
+            gotos[s][X] = t
+
+    # Las transiciones redirigidas pueden dejar estados inalcanzables:
+    # se renumeran en orden de recorrido desde el estado inicial
+    number = {0: 0}
+    reachable = deque([0])
+    visit = []
+    while reachable:
+        s = reachable.popleft()
+        visit.append(s)
+        for t in gotos[s].values():
+            if t not in number:
+                number[t] = len(number)
+                reachable.append(t)
+
+    generator_clr.State._id = 0
+    states = []
+    for s in visit:
+        kernel = [generator_clr.Item(prod, dot, la) for (prod, dot), la in kernels[s].items()]
+        state = generator_clr.State(generator_clr.closure(list(kernel)), kernel)
+        for X, t in gotos[s].items():
+            state.goto[g.symbols[X]] = number[t]
+        states.append(state)
+
+    return states
+
+def state_counts():
+    """
+    Number of states of the CLR(1) and LALR(1) automata of the current
+    (augmented) grammar, to compare with the minimal LR(1) one. The CLR(1)
+    collection is built in kernel_only mode to keep it small.
+    """
+    return {
+        "CLR(1)": len(generator_clr.calc_states(kernel_only=True)),
+        "LALR(1)": len(generator_lr.calc_states(symbols=generator_clr.nt_list + generator_clr.t_list)),
+    }
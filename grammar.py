@@ -0,0 +1,144 @@
+LAMBDA = 'λ'
+LAMBDA_SYMBOLS = ('λ', 'ε')
+
+# Ids reservados: λ/ε y el fin de cadena '$'
+EPSILON = 0
+EOF = 1
+
+# Los conjuntos de terminales (First, Follow, lookaheads) son enteros usados
+# como máscaras de bits: el bit i está encendido si el símbolo de id i pertenece.
+EPSILON_BIT = 1 << EPSILON
+
+def bits(ids):
+    mask = 0
+    for sym in ids:
+        mask |= 1 << sym
+    return mask
+
+def bit_ids(mask):
+    # Ids presentes en una máscara, en orden creciente
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+# ------------------------------------------------------------------
+
+class Grammar:  # Gramática compilada: símbolos internados como enteros
+    """
+    Compiled form of a production list. Each production is parsed once and
+    stored as a head id plus a tuple of body symbol ids, so the generators
+    never split '→' strings in their inner loops.
+
+    Symbol ids are dense: 0 is λ/ε, 1 is '$', then the terminals, then the
+    nonterminals. Any id below `n_terminals` is a terminal (or λ/$), so sets
+    of terminals fit in an int bitmask (see bits / bit_ids).
+    λ/ε never appear inside a body: an empty production has body ().
+    For display, id 0 is named after whichever of λ/ε the grammar uses.
+    """
+
+    def __init__(self, productions, nonterminals=(), terminals=()):
+        self.productions = list(productions)  # Texto original, solo para mostrar
+        self.symbols = [LAMBDA, '$']
+        self.ids = {'λ': EPSILON, 'ε': EPSILON, '$': EOF}
+
+        parsed = []
+        for prod in self.productions:
+            if '→' not in prod:
+                raise ValueError(f"Producción mal formada, sin '→': {prod}")
+            head, body = prod.split('→', 1)
+            parsed.append((head.strip(), body.split()))
+
+        # λ y ε comparten el id 0; se muestra con el símbolo que usó el usuario
+        # (el primero que aparezca en un cuerpo, si no el declarado)
+        terminals = list(terminals)
+        for sym in [s for _, body in parsed for s in body] + terminals:
+            if sym in LAMBDA_SYMBOLS:
+                self.symbols[EPSILON] = sym
+                break
+
+        nonterminals = [nt for nt in nonterminals if nt not in self.ids]
+        nt_names = set(nonterminals) | set(head for head, _ in parsed)
+
+        # Terminales: primero los declarados, luego los que solo aparecen en cuerpos
+        for sym in terminals:
+            if sym not in nt_names:
+                self._intern(sym)
+        for _, body in parsed:
+            for sym in body:
+                if sym not in nt_names:
+                    self._intern(sym)
+        self.n_terminals = len(self.symbols)
+
+        # No terminales: orden declarado, luego cabezas no declaradas
+        for sym in nonterminals:
+            self._intern(sym)
+        for head, _ in parsed:
+            self._intern(head)
+
+        if nonterminals:
+            self.start = self.ids[nonterminals[0]]
+        elif parsed:
+            self.start = self.ids[parsed[0][0]]
+        else:
+            self.start = None
+
+        self.heads = []
+        self.bodies = []
+        self.by_head = {nt: [] for nt in self.nonterminals}
+        for i, (head, body) in enumerate(parsed):
+            head_id = self.ids[head]
+            self.heads.append(head_id)
+            self.bodies.append(tuple(self.ids[s] for s in body if self.ids[s] != EPSILON))
+            self.by_head[head_id].append(i)
+
+        self._numbers = None  # (cabeza, cuerpo) -> índice, ver production_number
+
+        # Resultados del análisis, calculados por firstandfollows
+        self.nullable = None
+        self.first = None
+        self.suffix_first = None
+        self.suffix_nullable = None
+        self.follow = None
+        self.lr0_closure = None  # nt -> producciones de su clausura LR(0), ver firstandfollows.lr0_closures
+        self.uses = None  # nt -> [(producción, posición)], ver firstandfollows._index_productions
+
+    def _intern(self, name):
+        if name not in self.ids:
+            self.ids[name] = len(self.symbols)
+            self.symbols.append(name)
+        return self.ids[name]
+
+    @property
+    def terminals(self):  # Incluye '$', excluye λ
+        return range(EOF, self.n_terminals)
+
+    @property
+    def nonterminals(self):
+        return range(self.n_terminals, len(self.symbols))
+
+    def is_terminal(self, sym):
+        return sym < self.n_terminals
+
+    def is_nonterminal(self, sym):
+        return sym >= self.n_terminals
+
+    def production_number(self, head, body):
+        """
+        Index of the first production head → body (symbol ids, λ removed),
+        or -1. The (head, body) -> index dict is built once, on first use.
+        """
+        if self._numbers is None:
+            self._numbers = {}
+            for i, key in enumerate(zip(self.heads, self.bodies)):
+                self._numbers.setdefault(key, i)
+        return self._numbers.get((head, tuple(body)), -1)
+
+    def names(self, syms):
+        return [self.symbols[s] for s in syms]
+
+    def mask(self, names):
+        return bits(self.ids[name] for name in names)
+
+    def mask_names(self, mask):  # Solo para mostrar/exportar
+        return [self.symbols[s] for s in bit_ids(mask)]
@@ -0,0 +1,526 @@
+from array import array
+from collections import Counter, OrderedDict
+import mmap
+import struct
+import sys
+from grammar import EOF
+
+# Cada acción es un entero:
+#   s > 0   desplazar al estado s - 1
+#   -1      aceptar (reducir por Z → S, la producción 0)
+#   r < -1  reducir por la producción -r - 1
+#   0       error (celda vacía)
+ERROR = 0
+ACCEPT = -1
+
+def shift(state):
+    return state + 1
+
+def reduce(prod):
+    return -(prod + 1)
+
+def action_text(action):
+    # Forma de texto de una acción, solo para mostrar: 's3', 'r2', 'Aceptar'
+    if action > 0:
+        return f"s{action - 1}"
+    if action == ACCEPT:
+        return 'Aceptar'
+    return f"r{-action - 1}"
+
+
+class LRTable:
+    """
+    Compiled LR action/goto table. Each state has an array('i') row of
+    actions indexed by terminal id and an array('i') row of gotos indexed by
+    nonterminal id - n_terminals (-1 for no goto), so the drivers never
+    parse action strings. The production heads, lengths and texts are
+    copied in, so the table is all the driver needs.
+
+    A conflicting cell keeps one action (shift over reduce, then the lowest
+    production) and records all of them in conflicts[(state, terminal)].
+    rows() gives the set/string form shown by the GUI.
+    """
+
+    def __init__(self, g, n_states):
+        self.symbols = list(g.symbols)
+        self.ids = dict(g.ids)
+        self.n_terminals = g.n_terminals
+        n_nonterminals = len(g.symbols) - g.n_terminals
+
+        self.heads = array('i', g.heads)
+        self.lengths = array('i', (len(body) for body in g.bodies))
+        self.productions = list(g.productions)
+
+        self.action = [array('i', [ERROR]) * self.n_terminals for _ in range(n_states)]
+        self.goto = [array('i', [-1]) * n_nonterminals for _ in range(n_states)]
+        self.conflicts = {}  # (estado, terminal) -> conjunto de acciones
+
+    def __len__(self):
+        return len(self.action)
+
+    def add_action(self, state, term, action):
+        current = self.action[state][term]
+        if current == ERROR:
+            self.action[state][term] = action
+        elif current != action:
+            self.conflicts.setdefault((state, term), {current}).add(action)
+            # Con esta codificación max() prefiere desplazar, luego aceptar,
+            # luego la producción de menor número
+            self.action[state][term] = max(current, action)
+
+    def set_goto(self, state, nt, target):
+        self.goto[state][nt - self.n_terminals] = target
+
+    def get_action(self, state, term):
+        return self.action[state][term]
+
+    def get_goto(self, state, nt):
+        return self.goto[state][nt - self.n_terminals]
+
+    def rows(self):
+        """
+        Display form: state -> OrderedDict symbol -> 'sN' / 'rN' / 'Aceptar',
+        a set of those for a conflict, or 'N' for a goto.
+        """
+        table = OrderedDict()
+        for state, actions in enumerate(self.action):
+            row = table[state] = OrderedDict()
+            for term, action in enumerate(actions):
+                if action != ERROR:
+                    conflict = self.conflicts.get((state, term))
+                    if conflict:
+                        row[self.symbols[term]] = {action_text(a) for a in conflict}
+                    else:
+                        row[self.symbols[term]] = action_text(action)
+            for k, target in enumerate(self.goto[state]):
+                if target >= 0:
+                    row[self.symbols[self.n_terminals + k]] = str(target)
+        return table
+
+
+def terminal_classes(table):
+    """
+    Groups the terminals whose action columns are identical in every state
+    (e.g. the operators of one precedence level). Returns (term_class,
+    representatives): term_class[t] is the class of terminal id t and
+    representatives[c] is one terminal of class c.
+    """
+    columns = {}  # columna -> clase
+    term_class = array('i', [0]) * table.n_terminals
+    representatives = []
+    for term in range(table.n_terminals):
+        column = tuple(row[term] for row in table.action)
+        if column not in columns:
+            columns[column] = len(representatives)
+            representatives.append(term)
+        term_class[term] = columns[column]
+    return term_class, representatives
+
+def unique_rows(rows):
+    # Filas distintas y, por cada fila original, el índice de su copia única
+    index = {}
+    row_of = array('i')
+    unique = []
+    for row in rows:
+        key = row.tobytes()
+        if key not in index:
+            index[key] = len(unique)
+            unique.append(row)
+        row_of.append(index[key])
+    return row_of, unique
+
+
+class CompactTable:
+    """
+    An LRTable with equal terminal columns and equal rows stored once:
+    actions are looked up as action[action_row[state]][term_class[term]]
+    and gotos as goto[goto_row[state]][nt - n_terminals]. Every cell keeps
+    its value, so parsing behaves exactly as on the full table.
+    """
+
+    def __init__(self, table):
+        self.symbols = table.symbols
+        self.ids = table.ids
+        self.n_terminals = table.n_terminals
+        self.heads = table.heads
+        self.lengths = table.lengths
+        self.productions = table.productions
+
+        self.n_states = len(table)
+        n_nonterminals = len(table.symbols) - table.n_terminals
+        self.dense_size = self.n_states * (table.n_terminals + n_nonterminals)
+
+        self.term_class, representatives = terminal_classes(table)
+        self.n_classes = len(representatives)
+        self.action_row, self.action = unique_rows(
+            [array('i', (row[t] for t in representatives)) for row in table.action])
+        self.goto_row, self.goto = unique_rows(table.goto)
+
+    def __len__(self):
+        return self.n_states
+
+    @property
+    def size(self):
+        # Enteros guardados en total
+        return (len(self.term_class) + len(self.action_row) + len(self.goto_row)
+                + sum(map(len, self.action)) + sum(map(len, self.goto)))
+
+    @property
+    def ratio(self):
+        # Tamaño comprimido / tamaño de la tabla completa
+        return self.size / self.dense_size if self.dense_size else 1.0
+
+    def get_action(self, state, term):
+        return self.action[self.action_row[state]][self.term_class[term]]
+
+    def get_goto(self, state, nt):
+        return self.goto[self.goto_row[state]][nt - self.n_terminals]
+
+
+class PackedTable:
+    """
+    Row-displacement (comb-vector) form of an LRTable, as in yacc/bison.
+
+    Every action row gets a default reduction (its most frequent reduce)
+    and every nonterminal a default goto (its most frequent target); only
+    the other entries are stored. The action rows (indexed by terminal) and
+    the goto column of each nonterminal (indexed by state) are overlaid in
+    one pair of arrays at offsets base[...], so that
+
+        i = base[owner] + key
+        value = next[i] if check[i] == owner else default
+
+    with owner = row_of[state] for actions and n_rows + (nt - n_terminals)
+    for gotos. Lookups are O(1). As with yacc, a default reduction may run
+    where the full table has an error; the error is then found on the
+    next shift, before any more input is consumed.
+
+    With classes=True, terminals with equal columns share one key
+    (term_class, see terminal_classes) and states with equal action rows
+    share one packed row, before packing.
+    """
+
+    def __init__(self, table, classes=False):
+        self.symbols = table.symbols
+        self.ids = table.ids
+        self.n_terminals = table.n_terminals
+        self.heads = table.heads
+        self.lengths = table.lengths
+        self.productions = table.productions
+
+        self.n_states = n_states = len(table)
+        n_nonterminals = len(table.symbols) - table.n_terminals
+        self.dense_size = n_states * (table.n_terminals + n_nonterminals)
+
+        if classes:
+            self.term_class, representatives = terminal_classes(table)
+            self.row_of, rows = unique_rows(
+                [array('i', (row[t] for t in representatives)) for row in table.action])
+        else:
+            self.term_class = array('i', range(table.n_terminals))
+            self.row_of = array('i', range(n_states))
+            rows = table.action
+        self.n_classes = len(rows[0]) if rows else table.n_terminals
+        self.n_rows = n_rows = len(rows)
+
+        # Vectores a superponer: (dueño, {clave: valor}) sin los valores por defecto
+        vectors = []
+        self.default_action = array('i', [ERROR]) * n_rows
+        for r, actions in enumerate(rows):
+            reduces = Counter(a for a in actions if a < ACCEPT)
+            if reduces:
+                # La más frecuente; a igual frecuencia, la producción menor
+                self.default_action[r] = max(reduces, key=lambda a: (reduces[a], a))
+            default = self.default_action[r]
+            vectors.append((r, {key: a for key, a in enumerate(actions)
+                                if a != ERROR and a != default}))
+
+        self.default_goto = array('i', [-1]) * n_nonterminals
+        for k in range(n_nonterminals):
+            column = {state: table.goto[state][k] for state in range(n_states)
+                      if table.goto[state][k] >= 0}
+            targets = Counter(column.values())
+            if targets:
+                self.default_goto[k] = max(targets, key=lambda t: (targets[t], -t))
+            default = self.default_goto[k]
+            vectors.append((n_rows + k, {state: t for state, t in column.items() if t != default}))
+
+        # Primer ajuste, de los vectores más llenos a los más vacíos
+        self.base = array('i', [0]) * len(vectors)
+        check = []
+        values = []
+        occupied = bytearray()  # 1 si la casilla ya tiene dueño
+        first_free = 0
+        for owner, entries in sorted(vectors, key=lambda v: -len(v[1])):
+            if not entries:
+                continue  # Todo por defecto: base 0, check nunca coincide
+            keys = sorted(entries)
+            # Solo se prueban bases donde keys[0] cae en una casilla libre;
+            # más allá del final del arreglo todas lo están
+            p = max(first_free, keys[0])
+            while True:
+                free = occupied.find(0, p)
+                p = free if free != -1 else max(p, len(occupied))
+                base = p - keys[0]
+                if all(base + key >= len(occupied) or not occupied[base + key] for key in keys[1:]):
+                    break
+                p += 1
+            end = base + keys[-1] + 1
+            if end > len(check):
+                occupied.extend(bytes(end - len(check)))
+                check.extend([-1] * (end - len(check)))
+                values.extend([ERROR] * (end - len(values)))
+            for key in keys:
+                occupied[base + key] = 1
+                check[base + key] = owner
+                values[base + key] = entries[key]
+            self.base[owner] = base
+            first_free = occupied.find(0, first_free)
+            if first_free == -1:
+                first_free = len(occupied)
+
+        # Relleno: base + clave nunca se sale de los arreglos
+        width = max(self.n_classes, n_states)
+        pad = max(self.base, default=0) + width - len(check)
+        if pad > 0:
+            check.extend([-1] * pad)
+            values.extend([ERROR] * pad)
+        self.check = array('i', check)
+        self.next = array('i', values)
+
+    def __len__(self):
+        return self.n_states
+
+    @property
+    def size(self):
+        # Enteros guardados en total
+        return (len(self.term_class) + len(self.row_of)
+                + len(self.base) + len(self.check) + len(self.next)
+                + len(self.default_action) + len(self.default_goto))
+
+    @property
+    def ratio(self):
+        # Tamaño comprimido / tamaño de la tabla completa
+        return self.size / self.dense_size if self.dense_size else 1.0
+
+    def get_action(self, state, term):
+        row = self.row_of[state]
+        i = self.base[row] + self.term_class[term]
+        if self.check[i] == row:
+            return self.next[i]
+        return self.default_action[row]
+
+    def get_goto(self, state, nt):
+        owner = self.n_rows + nt - self.n_terminals
+        i = self.base[owner] + state
+        if self.check[i] == owner:
+            return self.next[i]
+        return self.default_goto[nt - self.n_terminals]
+
+
+# ------------------------------------------------------------------
+# Formato binario de una PackedTable (ver save_table / load_table):
+#   cabecera  MAGIC, versión, tamaño de entero y los conteos (little-endian)
+#   símbolos  nombres UTF-8 separados por '\0', en orden de id
+#   textos    las producciones, igual
+#   arreglos  heads, lengths, term_class, row_of, base, check, next,
+#             default_action, default_goto: int32 little-endian
+# Cada sección empieza alineada a 4 bytes.
+
+MAGIC = b'LRTB'
+FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sHH10i')
+_ARRAYS = ('heads', 'lengths', 'term_class', 'row_of', 'base', 'check', 'next',
+           'default_action', 'default_goto')
+# Los arreglos se leen sin copiar solo si array('i') ya es int32 little-endian
+_NATIVE_INT32 = sys.byteorder == 'little' and array('i').itemsize == 4
+
+def _align(n):
+    return (n + 3) & ~3
+
+def save_table(table, path):
+    """
+    Writes a table in the versioned binary format read by load_table.
+    An LRTable is packed first, with terminal classes; a CompactTable has
+    lost its per-state rows and is rejected with TypeError.
+    """
+    if isinstance(table, LRTable):
+        table = PackedTable(table, classes=True)
+    elif not isinstance(table, PackedTable):
+        raise TypeError(f"Solo se guardan LRTable o PackedTable, no {type(table).__name__}")
+
+    symbols = '\0'.join(table.symbols).encode('utf-8')
+    productions = '\0'.join(table.productions).encode('utf-8')
+    # int32 little-endian explícito, sea cual sea el tamaño de int en la plataforma
+    arrays = [struct.pack(f'<{len(values)}i', *values)
+              for values in (getattr(table, name) for name in _ARRAYS)]
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, 4,
+                          len(table.symbols), table.n_terminals, len(table.productions),
+                          table.n_states, table.n_rows, table.n_classes,
+                          len(table.check), len(symbols), len(productions), 0)
+    with open(path, 'wb') as f:
+        f.write(header)
+        for blob in (symbols, productions):
+            f.write(blob + bytes(_align(len(blob)) - len(blob)))
+        for values in arrays:
+            f.write(values)
+
+def load_table(path):
+    """
+    Maps a file written by save_table and returns a PackedTable whose arrays
+    are memoryviews over the mapping: nothing is copied, and processes that
+    load the same file share its pages. Only the symbol and production
+    names are decoded. lrtable.parse runs on it like on a freshly packed one.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+
+    if len(view) < _HEADER.size:
+        raise ValueError(f"Archivo de tabla no válido: {path}")
+    (magic, version, int_size, n_symbols, n_terminals, n_productions, n_states,
+     n_rows, n_classes, n_check, symbols_size, productions_size, _) = _HEADER.unpack_from(view)
+    if magic != MAGIC or int_size != 4:
+        raise ValueError(f"Archivo de tabla no válido: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Versión de tabla no soportada: {version} (se esperaba {FORMAT_VERSION})")
+
+    table = PackedTable.__new__(PackedTable)
+    offset = _HEADER.size
+    if offset + _align(symbols_size) + _align(productions_size) > len(view):
+        raise ValueError(f"Archivo de tabla no válido: {path}")
+    names = []
+    for size in (symbols_size, productions_size):
+        names.append(bytes(view[offset:offset + size]).decode('utf-8').split('\0') if size else [])
+        offset += _align(size)
+    table.symbols, table.productions = names
+    table.ids = {name: i for i, name in enumerate(table.symbols)}
+    table.ids['ε'] = table.ids['λ'] = 0
+
+    n_nonterminals = n_symbols - n_terminals
+    lengths = (n_productions, n_productions, n_terminals, n_states, n_rows + n_nonterminals,
+               n_check, n_check, n_rows, n_nonterminals)
+    if offset + 4 * sum(lengths) > len(view):
+        raise ValueError(f"Archivo de tabla no válido: {path}")
+    for name, count in zip(_ARRAYS, lengths):
+        if _NATIVE_INT32:
+            values = view[offset:offset + 4 * count].cast('i')
+        else:
+            values = array('i', struct.unpack_from(f'<{count}i', view, offset))
+        setattr(table, name, values)
+        offset += 4 * count
+
+    table.n_terminals = n_terminals
+    table.n_states = n_states
+    table.n_rows = n_rows
+    table.n_classes = n_classes
+    table.dense_size = n_states * n_symbols
+    table._mapping = mapping  # Mantiene vivo el mapeo mientras viva la tabla
+    return table
+
+
+def parse(table, input_string):
+    """
+    Runs the LR driver on an LRTable, CompactTable or PackedTable. Returns
+    a list of steps, where each step is a dict:
+    {
+        'stack': str,   # State Stack
+        'symbols': str, # Symbol Stack
+        'input': str,   # Input Buffer
+        'action': str   # Action Taken
+    }
+    """
+    # 1. Tokenize Input
+    tokens = input_string.strip().split()
+    tokens.append('$') # Append EOF
+    # Ids de terminal; un token desconocido no tiene acción en ningún estado
+    term_ids = [table.ids.get(tok, -1) for tok in tokens]
+    term_ids[-1] = EOF
+
+    # 2. Initialize Stacks (state 0 is always the start state)
+    state_stack = [0]
+    symbol_stack = []
+
+    steps = []
+
+    cursor = 0
+    max_steps = 1000 # Safety break
+    step_count = 0
+
+    accepted = False
+
+    while step_count < max_steps:
+        current_state = state_stack[-1]
+        current_input = tokens[cursor]
+
+        # Snapshot state
+        steps.append({
+            'stack': " ".join(map(str, state_stack)),
+            'symbols': " ".join(symbol_stack),
+            'input': " ".join(tokens[cursor:]),
+            'action': ""
+        })
+
+        step_idx = len(steps) - 1
+
+        term = term_ids[cursor]
+        if 0 < term < table.n_terminals:
+            action = table.get_action(current_state, term)
+        else:
+            action = ERROR
+
+        if action == ERROR:
+            steps[step_idx]['action'] = f"Error: No action for input '{current_input}' in state {current_state}"
+            return steps # Fail
+
+        if action == ACCEPT:
+            steps[step_idx]['action'] = "Accept"
+            accepted = True
+            break
+
+        elif action > 0:
+            # SHIFT
+            next_state = action - 1
+
+            steps[step_idx]['action'] = f"Shift {next_state}"
+            state_stack.append(next_state)
+            symbol_stack.append(current_input)
+            cursor += 1
+
+        else:
+            # REDUCE
+            prod_idx = -action - 1
+            production = table.productions[prod_idx]
+            head = table.heads[prod_idx]
+
+            # Lambda bodies are already empty in the compiled grammar
+            count_to_pop = table.lengths[prod_idx]
+
+            if count_to_pop > 0:
+                del state_stack[-count_to_pop:]
+                del symbol_stack[-count_to_pop:]
+
+            # GOTO
+            top_state = state_stack[-1]
+            goto_state = table.get_goto(top_state, head)
+
+            if goto_state < 0:
+                steps[step_idx]['action'] = f"Reduce {prod_idx} ({production}), but GOTO error on [{top_state}, {table.symbols[head]}]"
+                return steps
+
+            state_stack.append(goto_state)
+            symbol_stack.append(table.symbols[head])
+            steps[step_idx]['action'] = f"Reduce {prod_idx}: {production}"
+
+        step_count += 1
+
+    if not accepted and step_count >= max_steps:
+         steps.append({
+            'stack': "...",
+            'symbols': "...",
+            'input': "...",
+            'action': "Terminated: Max steps reached"
+        })
+
+    return steps
@@ -18,6 +18,8 @@ import generator_ll
 import generator_lr
 import generator_clr
 import generator_lalr
+import generator_pager
+import lrtable
 
 class GrammarInputPanel(QWidget):
     def __init__(self):
@@ -48,6 +50,14 @@ class GrammarInputPanel(QWidget):
         self.chk_layout.addWidget(self.chk_epsilon)
         layout.addLayout(self.chk_layout)
 
+        # Reducción opcional: quitar símbolos inútiles antes de construir la tabla
+        self.chk_reduce = QCheckBox("Remove unreachable / unproductive symbols")
+        layout.addWidget(self.chk_reduce)
+
+        # Informe opcional del tamaño de la tabla empaquetada (empaquetar no es gratis)
+        self.chk_packed = QCheckBox("Report packed table size")
+        layout.addWidget(self.chk_packed)
+
         layout.addWidget(QLabel("Rules:"))
         
         instructions = QLabel("• One rule per line\n• Use '->' or '→' as separator\n• Tokens separated by space\n• Example: S -> A b")
@@ -154,7 +164,7 @@ class MainWindow(QMainWindow):
         algo_layout = QHBoxLayout()
         algo_layout.addWidget(QLabel("Algorithm:"))
         self.algo_selector = QComboBox()
-        self.algo_selector.addItems(["LL(1)", "LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"])
+        self.algo_selector.addItems(["LL(1)", "LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"])
         self.algo_selector.setCurrentText("LL(1)")
         algo_layout.addWidget(self.algo_selector)
         algo_layout.addStretch()
@@ -317,7 +327,7 @@ class MainWindow(QMainWindow):
     def update_export_button_text(self):
         # If any LR-based and States tab is active
         algo = self.algo_selector.currentText()
-        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"] and self.results_panel.tabs.currentIndex() == 3:
+        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"] and self.results_panel.tabs.currentIndex() == 3:
             self.results_panel.export_csv_button.setText("Export PDF")
         else:
             self.results_panel.export_csv_button.setText("Export CSV")
@@ -375,8 +385,18 @@ class MainWindow(QMainWindow):
         original_stdout = sys.stdout
         sys.stdout = output_capture
 
+        removed_symbols, removed_productions = [], []
+        state_counts = {}
+
         try:
             algo = self.algo_selector.currentText()
+
+            # --- Optional Step: Grammar Reduction (before augment_grammar) ---
+            if self.grammar_panel.chk_reduce.isChecked():
+                removed_symbols, removed_productions = firstandfollows.reduce_grammar()
+                print("--- REDUCCIÓN ---\\n")
+                print(f"Símbolos eliminados: {removed_symbols}")
+                print(f"Producciones eliminadas: {removed_productions}\\n")
             
             # --- Common Step: First & Follow ---
             # We calculate this once globally now
@@ -465,6 +485,27 @@ class MainWindow(QMainWindow):
                 table = generator_lalr.make_table_lalr(states)
                 self.current_table = table
 
+            elif algo == "Minimal LR(1)":
+                # Augmented Grammar logic (Same as CLR/LALR)
+                generator_clr.augment_grammar()
+
+                generator_clr.nt_list = list(firstandfollows.nt_list.keys())
+                generator_clr.t_list = list(firstandfollows.t_list.keys()) + ['$']
+
+                # State counts of CLR(1) / LALR(1) for comparison
+                state_counts = generator_pager.state_counts()
+
+                print("--- MINIMAL LR(1) STATES (Pager) ---\\n")
+                states = generator_pager.calc_states_pager()
+                self.current_states = states
+                state_counts[algo] = len(states)
+
+                self.refresh_states()
+
+                # Same states as CLR(1): same table and parser
+                table = generator_clr.make_table(states)
+                self.current_table = table
+
             elif algo == "LR(0)":
                 # Augmented Grammar logic
                 generator_lr.augment_grammar()
@@ -520,17 +561,32 @@ class MainWindow(QMainWindow):
 
         # 5. Update UI
         # self.first_follow_text.setPlainText(first_follow_str) # Removed text view
-        self.update_results_table(self.current_table)
+        display_table = self.current_table
+        packed = None
+        if isinstance(display_table, lrtable.LRTable):
+            if self.grammar_panel.chk_packed.isChecked():
+                packed = lrtable.PackedTable(display_table, classes=True)  # Solo para informar la compresión
+            display_table = display_table.rows()  # Forma de texto, solo para mostrar
+        self.update_results_table(display_table)
         self.update_productions_list(firstandfollows.production_list)
         
         # Adjust tabs visibility based on algo selection (redundant but ensures consistency)
         # self.on_algo_changed(algo) 
 
-        QMessageBox.information(self, "Success", "Parser Generated Successfully.")
+        message = "Parser Generated Successfully."
+        if removed_symbols or removed_productions:
+            message += f"\n\nRemoved symbols: {', '.join(removed_symbols) or '-'}"
+            message += f"\nRemoved rules: {len(removed_productions)}"
+        if state_counts:
+            message += "\n\nStates: " + ", ".join(f"{name} {count}" for name, count in state_counts.items())
+        if packed is not None:
+            message += f"\n\nPacked table: {packed.size} of {packed.dense_size} entries ({packed.ratio:.0%})"
+            message += f"\n{packed.n_classes} terminal classes, {packed.n_rows} distinct action rows"
+        QMessageBox.information(self, "Success", message)
         
     def parse_input_string(self):
         algo = self.algo_selector.currentText()
-        if algo not in ["LL(1)", "LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"]:
+        if algo not in ["LL(1)", "LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"]:
              QMessageBox.warning(self, "Warning", f"Parse Tree is currently not implemented for {algo}.")
              return
 
@@ -565,13 +621,13 @@ class MainWindow(QMainWindow):
                  self.results_panel.parse_steps_table.setItem(i, 1, QTableWidgetItem(step['input']))
                  self.results_panel.parse_steps_table.setItem(i, 2, QTableWidgetItem(step['action']))
                  
-        elif algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"]:
+        elif algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"]:
             # LR-style Simulation
             
-            if algo == "CLR(1)":
+            if algo in ["CLR(1)", "Minimal LR(1)"]:
                 steps = generator_clr.parse(self.current_table, input_str)
             elif algo == "LALR(1)":
-                 # LALR uses CLR's parse which now handles string IDs
+                 # LALR uses CLR's parse (same integer state ids)
                  steps = generator_clr.parse(self.current_table, input_str)
             else:
                 steps = generator_lr.parse(self.current_table, input_str)
@@ -702,7 +758,7 @@ class MainWindow(QMainWindow):
     def export_csv(self):
         # Check if we should do PDF export instead (LR-based States)
         algo = self.algo_selector.currentText()
-        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"] and self.results_panel.tabs.currentIndex() == 3: # States Tab
+        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"] and self.results_panel.tabs.currentIndex() == 3: # States Tab
              self.export_pdf_states()
              return
         # Determine active tab
@@ -771,11 +827,11 @@ class MainWindow(QMainWindow):
 
     def refresh_states(self):
         algo = self.algo_selector.currentText()
-        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)"] and self.current_states:
+        if algo in ["LR(0)", "SLR(1)", "CLR(1)", "LALR(1)", "Minimal LR(1)"] and self.current_states:
              show_lambda = self.results_panel.chk_show_lambda.isChecked()
              empty_symbol = 'ε' if self.grammar_panel.chk_epsilon.isChecked() else 'λ'
              
-             if algo == "CLR(1)":
+             if algo in ["CLR(1)", "Minimal LR(1)"]:
                  formatted_states = generator_clr.format_states(self.current_states, show_lambda=show_lambda, empty_symbol=empty_symbol)
              elif algo == "LALR(1)":
                  formatted_states = generator_lalr.format_states(self.current_states, show_lambda=show_lambda, empty_symbol=empty_symbol)
@@ -800,7 +856,7 @@ class MainWindow(QMainWindow):
             show_lambda = self.results_panel.chk_show_lambda.isChecked()
             empty_symbol = 'ε' if self.grammar_panel.chk_epsilon.isChecked() else 'λ'
             
-            if algo == "CLR(1)":
+            if algo in ["CLR(1)", "Minimal LR(1)"]:
                 generator_clr.export_items_to_pdf(
                     self.current_states, 
                     codigos_equivalentes={}, 
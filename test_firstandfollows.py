@@ -0,0 +1,40 @@
+import pytest
+
+import firstandfollows
+
+
+def load(productions, nonterminals, terminals):
+    firstandfollows.nt_list.clear()
+    firstandfollows.t_list.clear()
+    for name in nonterminals:
+        firstandfollows.nt_list[name] = firstandfollows.NonTerminal(name)
+    for name in terminals:
+        firstandfollows.t_list[name] = firstandfollows.Terminal(name)
+    firstandfollows.production_list[:] = productions
+    firstandfollows.compute_all_primeros()
+    firstandfollows.compute_all_siguientes()
+
+
+def test_use_before_definition():
+    # X se usa antes de definirse: primero se infiere como terminal
+    load(['E → T', 'T → id'], ['E', 'T'], ['id'])
+    firstandfollows.add_production('T → ( X )')
+    assert 'X' in firstandfollows.t_list
+
+    firstandfollows.add_production('X → E')
+    assert 'X' not in firstandfollows.t_list
+    assert firstandfollows.get_siguiente('X') == {')'}
+    assert firstandfollows.nt_list['X'].primero == {'id', '('}
+
+
+def test_grammar_file_separators(tmp_path):
+    path = tmp_path / 'g.txt'
+    path.write_text('S -> a B\nB → b |\n', encoding='utf-8')
+    firstandfollows.load_grammar_file(path)
+    assert firstandfollows.production_list == ['S → a B', 'B → b', 'B → λ']
+
+    # Dos separadores en una línea: no se adivina cuál es el de la cabeza
+    for line in ('S -> a → b', 'S → a -> b', 'S -> a -> b', 'S -> a\n| b → c'):
+        path.write_text(line + '\n', encoding='utf-8')
+        with pytest.raises(ValueError):
+            firstandfollows.load_grammar_file(path)